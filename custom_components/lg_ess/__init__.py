@@ -1,20 +1,177 @@
 """The LG ESS inverter integration."""
 
+import asyncio
+from datetime import timedelta
+from functools import partial
 import logging
+import time
 
-from pyess.aio_ess import ESS, ESSException
+from pyess.aio_ess import ESSAuthException, ESSException
+import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, Platform
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import (
+    ConfigEntryAuthFailed,
+    ConfigEntryNotReady,
+    ServiceValidationError,
+)
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.entity_registry import async_migrate_entries
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .client import PooledESS, async_forget_ess, async_get_ess
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_DURATION,
+    ATTR_INTERVAL,
+    ATTR_METRICS,
+    CONF_ADAPTIVE_POLLING,
+    CONF_AGGREGATION_WINDOW,
+    CONF_EXTERNAL_STATISTICS,
+    CONF_GRACE_PERIOD,
+    CONF_HISTORY_HOURS,
+    CONF_MAX_INTERVAL,
+    DEFAULT_AGGREGATION_WINDOW,
+    DEFAULT_GRACE_PERIOD,
+    DEFAULT_HISTORY_HOURS,
+    DEFAULT_LIVE_DURATION,
+    DEFAULT_LIVE_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+    DOMAIN,
+    MAX_LIVE_DURATION,
+    SERVICE_GET_HISTORY,
+    SERVICE_REFRESH_SYSTEMINFO,
+    SERVICE_START_LIVE_MODE,
+    SERVICE_STOP_LIVE_MODE,
+    SIGNAL_ENTRY_UNLOADED,
+)
+from .coordinator import (
+    CommonCoordinator,
+    EssData,
+    HomeCoordinator,
+    SystemInfoCoordinator,
+    deadband,
+    polling_intervals,
+    systeminfo_store,
+)
+from .counters import counters_store
+from .external_statistics import HourlyStatistics
+from .websocket import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+SERVICE_SCHEMA = vol.Schema({vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string})
+LIVE_MODE_SCHEMA = SERVICE_SCHEMA.extend(
+    {
+        vol.Optional(ATTR_DURATION, default=DEFAULT_LIVE_DURATION): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_LIVE_DURATION)
+        ),
+        vol.Optional(ATTR_INTERVAL, default=DEFAULT_LIVE_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=5)
+        ),
+    }
+)
+
+HISTORY_SCHEMA = SERVICE_SCHEMA.extend(
+    {
+        vol.Optional(ATTR_DURATION, default=600): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=24 * 3600)
+        ),
+        vol.Optional(ATTR_METRICS): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+# Status fields of the common payload that change with firmware updates
+SYSTEMINFO_TRIGGERS = (("PCS", "pcs_stauts"), ("PCS", "operation_mode"))
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the LG ESS services and websocket commands."""
+
+    async def async_refresh_systeminfo(call: ServiceCall) -> None:
+        """Refresh the system info of one or all devices."""
+        for data in _service_targets(hass, call).values():
+            await data.system.async_refresh()
+
+    async def async_get_history(call: ServiceCall) -> ServiceResponse:
+        """Return the readings of the last seconds kept in memory."""
+        end = time.time()
+        start = end - call.data[ATTR_DURATION]
+        metrics = call.data.get(ATTR_METRICS)
+        return {
+            entry_id: {
+                name: coordinator.history.query(start, end, metrics)
+                for name, coordinator in (("home", data.home), ("common", data.common))
+                if coordinator.history is not None
+            }
+            for entry_id, data in _service_targets(hass, call).items()
+        }
+
+    async def async_start_live_mode(call: ServiceCall) -> None:
+        """Poll the power readings of one or all devices every few seconds."""
+        for data in _service_targets(hass, call).values():
+            data.home.async_start_live(
+                timedelta(seconds=call.data[ATTR_INTERVAL]),
+                timedelta(seconds=call.data[ATTR_DURATION]),
+            )
+
+    async def async_stop_live_mode(call: ServiceCall) -> None:
+        """Return to the configured polling."""
+        for data in _service_targets(hass, call).values():
+            data.home.async_stop_live()
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH_SYSTEMINFO,
+        async_refresh_systeminfo,
+        schema=SERVICE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        async_get_history,
+        schema=HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_LIVE_MODE,
+        async_start_live_mode,
+        schema=LIVE_MODE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_LIVE_MODE,
+        async_stop_live_mode,
+        schema=SERVICE_SCHEMA,
+    )
+    async_register_websocket_commands(hass)
+
+    return True
+
+
+def _service_targets(hass: HomeAssistant, call: ServiceCall) -> dict[str, EssData]:
+    """Return the runtime data by entry id of the entry of the call, or all."""
+    entries: dict[str, EssData] = hass.data.get(DOMAIN, {})
+    if ATTR_CONFIG_ENTRY_ID not in call.data:
+        return dict(entries)
+    entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+    if (data := entries.get(entry_id)) is not None:
+        return {entry_id: data}
+    raise ServiceValidationError(f"Config entry {entry_id} is not loaded")
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up LG ESS from config entry."""
@@ -22,33 +179,179 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
 
     try:
-        ess = await ESS.create(None, entry.data["password"], entry.data["host"])
-        hass.data[DOMAIN][entry.entry_id] = ess
+        ess = await async_get_ess(
+            hass, entry.data[CONF_HOST], entry.data[CONF_PASSWORD]
+        )
+    except ESSAuthException as e:
+        raise ConfigEntryAuthFailed from e
     except ESSException as e:
         _LOGGER.exception("Error setting up ESS api")
         raise ConfigEntryNotReady from e
 
+    home_interval, common_interval, system_interval = polling_intervals(entry.options)
+    common = CommonCoordinator(hass, ess, entry.entry_id, common_interval)
+    system = SystemInfoCoordinator(hass, ess, entry.entry_id, system_interval)
+    home = HomeCoordinator(hass, ess, home_interval)
+
+    # The system info rarely changes, with a cached copy the device and the
+    # entities are created right away and the live data follows later.
+    system_cached = await system.async_load_cache()
+    await common.counters.async_load()
+
+    # Fetch initial data so we have data when entities subscribe. The
+    # requests run concurrently, so startup waits for the slowest one only.
+    start = time.monotonic()
+    try:
+        if system_cached:
+            await _async_first_refresh(common, home)
+        else:
+            await _async_first_refresh(common, system, home)
+    except (ConfigEntryAuthFailed, ConfigEntryNotReady):
+        _async_release_ess(hass, ess)
+        raise
+    startup_duration = time.monotonic() - start
+    _LOGGER.debug("First refresh took %.3f seconds", startup_duration)
+
+    data = EssData(ess, common, system, home, startup_duration)
+    hass.data[DOMAIN][entry.entry_id] = data
+    _async_apply_options(entry, data)
+    if entry.options.get(CONF_EXTERNAL_STATISTICS, False):
+        statistics = HourlyStatistics(hass, entry.entry_id, entry.title)
+        await statistics.async_load()
+        entry.async_on_unload(common.async_subscribe_samples(statistics.async_sample))
+        data.external_statistics = True
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    entry.async_on_unload(
+        system.async_add_listener(
+            partial(_async_update_device, hass, entry, system),
+            (("pms", "model"), ("version", "pcs_version")),
+        )
+    )
+    entry.async_on_unload(system.async_watch(common, SYSTEMINFO_TRIGGERS))
+    entry.async_on_unload(home.async_stop_live)
+    entry.async_on_unload(
+        partial(
+            async_dispatcher_send, hass, SIGNAL_ENTRY_UNLOADED.format(entry.entry_id)
+        )
+    )
+    if system_cached:
+        entry.async_create_background_task(
+            hass, system.async_refresh(), "lg_ess systeminfo refresh"
+        )
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
+
     return True
 
 
+@callback
+def _async_apply_options(entry: ConfigEntry, data: EssData) -> None:
+    """Apply the polling, deadband and grace period options to the coordinators."""
+    options = entry.options
+    max_interval = None
+    if options.get(CONF_ADAPTIVE_POLLING, False):
+        max_interval = timedelta(
+            seconds=options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL)
+        )
+    home_interval, common_interval, system_interval = polling_intervals(options)
+    data.home.async_set_polling(home_interval, max_interval)
+    data.common.async_set_polling(common_interval, max_interval)
+    data.system.async_set_polling(system_interval, None)
+    data.home.deadband = data.common.deadband = deadband(options)
+    grace_period = options.get(CONF_GRACE_PERIOD, DEFAULT_GRACE_PERIOD)
+    for coordinator in (data.home, data.common, data.system):
+        coordinator.grace_period = timedelta(seconds=grace_period)
+    window = options.get(CONF_AGGREGATION_WINDOW, DEFAULT_AGGREGATION_WINDOW)
+    data.home.async_set_window(timedelta(seconds=window) if window else None)
+    hours = options.get(CONF_HISTORY_HOURS, DEFAULT_HISTORY_HOURS)
+    for coordinator in (data.home, data.common):
+        coordinator.async_set_history(timedelta(hours=hours) if hours else None)
+
+
+async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options, reload only if the energy entities change."""
+    data: EssData = hass.data[DOMAIN][entry.entry_id]
+    if entry.options.get(CONF_EXTERNAL_STATISTICS, False) != data.external_statistics:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    _async_apply_options(entry, data)
+
+
+@callback
+def _async_update_device(
+    hass: HomeAssistant, entry: ConfigEntry, system: SystemInfoCoordinator
+) -> None:
+    """Update the device once the live system info differs from the cache."""
+    if not system.last_update_success:
+        return
+    device_registry = dr.async_get(hass)
+    if device := device_registry.async_get_device(
+        identifiers={(DOMAIN, entry.entry_id)}
+    ):
+        device_registry.async_update_device(
+            device.id,
+            model=system.data["pms"]["model"],
+            sw_version=system.data["version"]["pcs_version"],
+        )
+
+
+async def _async_first_refresh(*coordinators) -> None:
+    """Run the first refresh of all coordinators concurrently.
+
+    All refreshes are awaited. If any of them was rejected because of the
+    password, ConfigEntryAuthFailed is raised to start a reauth flow.
+    Otherwise the first failure is raised as ConfigEntryNotReady.
+    """
+    results = await asyncio.gather(
+        *(
+            coordinator.async_config_entry_first_refresh()
+            for coordinator in coordinators
+        ),
+        return_exceptions=True,
+    )
+    errors = [result for result in results if isinstance(result, BaseException)]
+    for error in errors:
+        if isinstance(error, ConfigEntryAuthFailed):
+            raise error
+    if errors:
+        if isinstance(errors[0], ConfigEntryNotReady):
+            raise errors[0]
+        raise ConfigEntryNotReady from errors[0]
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        api = hass.data[DOMAIN].pop(entry.entry_id)
-        await api.destruct()
+        data: EssData = hass.data[DOMAIN].pop(entry.entry_id)
+        _async_release_ess(hass, data.ess)
 
     return unload_ok
 
 
+@callback
+def _async_release_ess(hass: HomeAssistant, ess: PooledESS) -> None:
+    """Drop the client of a device unless another loaded entry still uses it."""
+    if not any(other.ess is ess for other in hass.data[DOMAIN].values()):
+        async_forget_ess(hass, ess)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached system info and the counters of a removed entry."""
+    await systeminfo_store(hass, entry.entry_id).async_remove()
+    await counters_store(hass, entry.entry_id).async_remove()
+
+
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Migrate old entry."""
     _LOGGER.debug("Migrating from version %s", entry.version)
 
     # Add serialno to unique id in order to allow multiple devices
     if entry.version == 1:
-        ess = await ESS.create(None, entry.data[CONF_PASSWORD], entry.data[CONF_HOST])
+        ess = await async_get_ess(
+            hass, entry.data[CONF_HOST], entry.data[CONF_PASSWORD]
+        )
         serialno = (await ess.get_systeminfo())["pms"]["serialno"]
 
         @callback
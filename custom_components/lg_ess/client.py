@@ -0,0 +1,430 @@
+"""Shared ESS clients, one per device."""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import StrEnum
+from functools import partial
+from json import JSONDecodeError
+import logging
+import random
+import time
+from types import SimpleNamespace
+
+import aiohttp
+from pyess.aio_ess import ESS, ESSAuthException, ESSException
+from pyess.constants import LOGIN_URL, STATE_URLS, TIMESYNC_URL
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_CLIENTS = f"{DOMAIN}_clients"
+DATA_CLIENT_LOCKS = f"{DOMAIN}_client_locks"
+DATA_SESSION = f"{DOMAIN}_session"
+DATA_STATS = f"{DOMAIN}_request_stats"
+
+# Keep idle connections open across the longest default poll interval, the
+# TLS handshake costs the inverter more than the request itself
+KEEPALIVE_TIMEOUT = 45
+
+# Seconds a client logged in by a config flow waits for an entry to use it
+UNCLAIMED_TIMEOUT = 300
+
+# Minimum pause in seconds between two requests to the same device
+REQUEST_SPACING = 0.2
+
+# Responses to an expired auth key
+AUTH_FAILED = ({"auth": "auth_key failed"}, {"auth": "auth failed"})
+# Seconds to wait before the last retry of a failed time sync
+LOGIN_RETRY_MAX = 4
+
+# Consecutive failures that open the circuit breaker
+FAILURE_THRESHOLD = 3
+# Seconds the breaker stays open after the first and at most after many trips
+BACKOFF_MIN = 10
+BACKOFF_MAX = 600
+
+# Same limits as pyess uses for its own sessions
+TIMEOUT = aiohttp.ClientTimeout(connect=60, sock_read=60, sock_connect=60, total=180)
+
+
+@dataclass
+class RequestTiming:
+    """Duration of the phases of a request in seconds."""
+
+    # TCP connect and TLS handshake, zero on a reused connection
+    connect: float = 0.0
+    # Sending the request until the response headers arrived
+    wait: float = 0.0
+    # Reading the response body
+    transfer: float = 0.0
+
+
+@dataclass
+class RequestStats:
+    """Request statistics of a device."""
+
+    requests: int = 0
+    connections: int = 0
+    last: dict[str, RequestTiming] = field(default_factory=dict)
+
+
+class BreakerState(StrEnum):
+    """State of the circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """The device is considered unreachable, no request was sent."""
+
+
+class CircuitBreaker:
+    """Stop requests to a device that does not answer.
+
+    After FAILURE_THRESHOLD consecutive failures the breaker opens and all
+    requests fail right away. Once the backoff has passed a single probe
+    request is let through while half open. Its success closes the breaker,
+    its failure opens it again with twice the backoff.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a closed breaker."""
+        self.state = BreakerState.CLOSED
+        self.retry_at = 0.0
+        self._failures = 0
+        self._trips = 0
+        self._probing = False
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for state changes."""
+        self._listeners.append(update_callback)
+        return partial(self._listeners.remove, update_callback)
+
+    @callback
+    def async_before_request(self) -> None:
+        """Raise CircuitOpenError unless a request may be sent now."""
+        if self.state is BreakerState.OPEN:
+            if time.monotonic() < self.retry_at:
+                raise CircuitOpenError(
+                    f"Device unreachable, retrying in {self.retry_at - time.monotonic():.0f} s"
+                )
+            self._async_set_state(BreakerState.HALF_OPEN)
+        if self.state is BreakerState.HALF_OPEN:
+            if self._probing:
+                raise CircuitOpenError("Device unreachable, waiting for the probe")
+            self._probing = True
+
+    @callback
+    def async_success(self) -> None:
+        """Record a request the device answered."""
+        self._probing = False
+        self._failures = 0
+        self._trips = 0
+        self._async_set_state(BreakerState.CLOSED)
+
+    @callback
+    def async_failure(self) -> None:
+        """Record a request the device did not answer."""
+        self._failures += 1
+        if self.state is BreakerState.CLOSED and self._failures < FAILURE_THRESHOLD:
+            return
+        self._probing = False
+        self._trips += 1
+        backoff = min(BACKOFF_MIN * 2 ** (self._trips - 1), BACKOFF_MAX)
+        # Jitter keeps several devices from retrying in lockstep
+        self.retry_at = time.monotonic() + random.uniform(backoff / 2, backoff)
+        self._async_set_state(BreakerState.OPEN)
+
+    @callback
+    def async_release(self) -> None:
+        """End a request without a verdict on the reachability."""
+        self._probing = False
+
+    @callback
+    def _async_set_state(self, state: BreakerState) -> None:
+        if state is self.state:
+            return
+        _LOGGER.debug("Circuit breaker %s", state)
+        self.state = state
+        for update_callback in list(self._listeners):
+            update_callback()
+
+
+class PooledESS(ESS):
+    """ESS api using a shared HTTP session instead of one of its own.
+
+    The device handles concurrent requests badly, so state requests are sent
+    one after another. A request for a state that is already in flight waits
+    for the pending response instead of sending a second request.
+
+    When the auth key expires only one login is sent, other requests wait for
+    it and retry with the new key.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, password: str, host: str):
+        """Initialize the api without opening a session."""
+        # ESS.__init__ would open a new session for every client
+        self.name = None
+        self.pw = password
+        self.ip = host
+        self.logged_in = False
+        self.auth_key = None
+        self.session = session
+        self._lock = asyncio.Lock()
+        self._login_lock = asyncio.Lock()
+        self._pending: dict[str, asyncio.Future[dict]] = {}
+        self._last_request = 0.0
+        self.breaker = CircuitBreaker()
+        # Used by a config entry, not only logged in by a config flow
+        self.claimed = False
+
+    async def get_state(self, state: str, timeout: float | None = None) -> dict:
+        """Fetch a state, sharing the response of a request in flight.
+
+        The timeout limits the request to the device, the wait for the
+        requests queued before it does not count.
+        """
+        if (pending := self._pending.get(state)) is None:
+            pending = asyncio.ensure_future(self._async_get_state(state, timeout))
+            self._pending[state] = pending
+            pending.add_done_callback(partial(self._async_done, state))
+        # Shielded, so a cancelled caller does not cancel the other waiters
+        return await asyncio.shield(pending)
+
+    def _async_done(self, state: str, pending: asyncio.Future[dict]) -> None:
+        del self._pending[state]
+        if not pending.cancelled():
+            # Retrieved here in case every caller was cancelled meanwhile
+            pending.exception()
+
+    async def _async_get_state(self, state: str, timeout: float | None) -> dict:
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            if (delay := self._last_request + REQUEST_SPACING - loop.time()) > 0:
+                await asyncio.sleep(delay)
+            try:
+                return await self.post_json_with_auth(
+                    STATE_URLS[state].format(self.ip), timeout=timeout
+                )
+            finally:
+                self._last_request = loop.time()
+
+    async def async_login(self, retry: int = 1, timeout: float | None = None) -> str:
+        """Log in and sync the time of the device.
+
+        Raises ESSAuthException if the device rejects the password. The
+        timeout applies to each request.
+        """
+        client_timeout = _client_timeout(timeout)
+        async with self.session.put(
+            LOGIN_URL.format(self.ip),
+            json={"password": self.pw},
+            timeout=client_timeout,
+        ) as r:
+            response_json = await r.json()
+        if response_json.get("status") == "password mismatched":
+            raise ESSAuthException("wrong password")
+        auth_key = response_json["auth_key"]
+        timesync_info = {
+            "auth_key": auth_key,
+            "by": "phone",
+            "date_time": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
+        }
+        async with self.session.put(
+            TIMESYNC_URL.format(self.ip), json=timesync_info, timeout=client_timeout
+        ) as r:
+            try:
+                response_json = await r.json()
+            except (JSONDecodeError, aiohttp.ContentTypeError) as err:
+                # pyess retries the same way, but blocking the event loop
+                if retry > LOGIN_RETRY_MAX:
+                    raise ESSException("time sync failed") from err
+                response_json = None
+        if response_json is None:
+            await asyncio.sleep(retry)
+            return await self.async_login(retry * 2, timeout)
+        if response_json.get("status") != "success":
+            raise ESSException(f"time sync failed: {response_json}")
+        self.auth_key = auth_key
+        self.logged_in = True
+        return auth_key
+
+    async def post_json_with_auth(
+        self,
+        url: str,
+        retries: int = 1,
+        extra_json_data: dict | None = None,
+        timeout: float | None = None,
+    ) -> dict:
+        """Post with the auth key, logging in again once if it expired."""
+        client_timeout = _client_timeout(timeout)
+        for attempt in range(retries + 1):
+            auth_key = self.auth_key
+            json = {"auth_key": auth_key, **(extra_json_data or {})}
+            async with self.session.post(url, json=json, timeout=client_timeout) as r:
+                response_json = await r.json()
+                response_status = r.status
+            if response_status == 200 or response_json not in AUTH_FAILED:
+                return response_json
+            if attempt < retries:
+                await self._async_relogin(auth_key, timeout)
+        raise ESSException(f"auth key rejected after login: {response_json}")
+
+    async def _async_relogin(
+        self, expired_key: str | None, timeout: float | None
+    ) -> None:
+        """Log in again, unless another request already did."""
+        async with self._login_lock:
+            if self.auth_key != expired_key:
+                return
+            _LOGGER.info("Auth key of %s expired, logging in again", self.ip)
+            await self.async_login(timeout=timeout)
+
+    def __del__(self, *args):
+        """Keep the shared session open."""
+
+    async def destruct(self, *args):
+        """Keep the shared session open, it is closed with Home Assistant."""
+
+
+def _client_timeout(timeout: float | None) -> aiohttp.ClientTimeout:
+    """Return the timeout of a request, the session default if None."""
+    return TIMEOUT if timeout is None else aiohttp.ClientTimeout(total=timeout)
+
+
+def _timing_trace(stats: dict[str, RequestStats]) -> aiohttp.TraceConfig:
+    """Return a trace config recording the timings per device and path."""
+    trace = aiohttp.TraceConfig()
+    loop = asyncio.get_running_loop()
+
+    async def on_request_start(
+        session: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestStartParams,
+    ) -> None:
+        ctx.start = loop.time()
+        ctx.timing = RequestTiming()
+        device = stats.setdefault(params.url.raw_authority, RequestStats())
+        device.requests += 1
+        device.last[params.url.path] = ctx.timing
+
+    async def on_connection_create_start(
+        session: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceConnectionCreateStartParams,
+    ) -> None:
+        ctx.connect_start = loop.time()
+
+    async def on_connection_create_end(
+        session: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceConnectionCreateEndParams,
+    ) -> None:
+        ctx.timing.connect = loop.time() - ctx.connect_start
+
+    async def on_request_end(
+        session: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestEndParams,
+    ) -> None:
+        ctx.headers = loop.time()
+        ctx.timing.wait = ctx.headers - ctx.start - ctx.timing.connect
+        if ctx.timing.connect:
+            stats[params.url.raw_authority].connections += 1
+
+    async def on_response_chunk_received(
+        session: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceResponseChunkReceivedParams,
+    ) -> None:
+        ctx.timing.transfer = loop.time() - ctx.headers
+
+    trace.on_request_start.append(on_request_start)
+    trace.on_connection_create_start.append(on_connection_create_start)
+    trace.on_connection_create_end.append(on_connection_create_end)
+    trace.on_request_end.append(on_request_end)
+    trace.on_response_chunk_received.append(on_response_chunk_received)
+    return trace
+
+
+@callback
+def _async_get_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Return the session shared by all devices.
+
+    Connections are kept alive between polls, so most requests skip the TCP
+    connect and the TLS handshake.
+    """
+    if (session := hass.data.get(DATA_SESSION)) is not None:
+        return session
+
+    session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(ssl=False, keepalive_timeout=KEEPALIVE_TIMEOUT),
+        timeout=TIMEOUT,
+        trace_configs=[_timing_trace(hass.data.setdefault(DATA_STATS, {}))],
+    )
+
+    async def _async_close(event: Event) -> None:
+        await session.close()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close)
+    hass.data[DATA_SESSION] = session
+    return session
+
+
+@callback
+def async_request_stats(hass: HomeAssistant, ess: PooledESS) -> RequestStats:
+    """Return the request statistics of a device."""
+    return hass.data.get(DATA_STATS, {}).get(ess.ip, RequestStats())
+
+
+async def async_get_ess(
+    hass: HomeAssistant, host: str, password: str, *, claim: bool = True
+) -> PooledESS:
+    """Return the logged in client of a device.
+
+    The client is created and logged in on first use. Config flow, migration
+    and setup all share it, so a device sees one login only. A config flow
+    does not claim the client, it is dropped again unless an entry claims it
+    within UNCLAIMED_TIMEOUT, e.g. when the flow was aborted.
+    """
+    clients: dict[str, PooledESS] = hass.data.setdefault(DATA_CLIENTS, {})
+    locks: dict[str, asyncio.Lock] = hass.data.setdefault(DATA_CLIENT_LOCKS, {})
+    # One lock per device, a device that does not answer only blocks itself
+    async with locks.setdefault(host, asyncio.Lock()):
+        if (ess := clients.get(host)) is None or ess.pw != password:
+            ess = PooledESS(_async_get_session(hass), password, host)
+            _LOGGER.debug("Logging in to %s", host)
+            await ess.async_login()
+            clients[host] = ess
+            if not claim:
+                async_call_later(
+                    hass, UNCLAIMED_TIMEOUT, partial(_async_forget_unclaimed, hass, ess)
+                )
+        ess.claimed = ess.claimed or claim
+        return ess
+
+
+@callback
+def _async_forget_unclaimed(
+    hass: HomeAssistant, ess: PooledESS, _now: datetime
+) -> None:
+    if not ess.claimed:
+        async_forget_ess(hass, ess)
+
+
+@callback
+def async_forget_ess(hass: HomeAssistant, ess: PooledESS) -> None:
+    """Drop a client that is no longer used."""
+    clients: dict[str, PooledESS] = hass.data.get(DATA_CLIENTS, {})
+    if clients.get(ess.ip) is ess:
+        del clients[ess.ip]
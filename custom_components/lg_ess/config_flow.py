@@ -1,17 +1,54 @@
 """Config flow for LG ESS integration."""
+from collections.abc import Mapping
 import logging
 from typing import Any
 
-from pyess.aio_ess import ESS, ESSAuthException, ESSException
+from pyess.aio_ess import ESSAuthException, ESSException
 import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.components import zeroconf
-from homeassistant.config_entries import ConfigFlowResult
+from homeassistant.config_entries import ConfigEntry, ConfigFlowResult, OptionsFlow
 from homeassistant.const import CONF_HOST, CONF_PASSWORD
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.selector import (
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
+)
 
-from .const import DOMAIN
+from .client import async_get_ess
+from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_AGGREGATION_WINDOW,
+    CONF_COMMON_INTERVAL,
+    CONF_DEADBAND_CURRENT,
+    CONF_DEADBAND_MAX_AGE,
+    CONF_DEADBAND_POWER,
+    CONF_DEADBAND_RELATIVE,
+    CONF_DEADBAND_VOLTAGE,
+    CONF_EXTERNAL_STATISTICS,
+    CONF_GRACE_PERIOD,
+    CONF_HISTORY_HOURS,
+    CONF_HOME_INTERVAL,
+    CONF_MAX_INTERVAL,
+    CONF_PROFILE,
+    CONF_SYSTEMINFO_INTERVAL,
+    DEFAULT_AGGREGATION_WINDOW,
+    DEFAULT_DEADBAND_CURRENT,
+    DEFAULT_DEADBAND_MAX_AGE,
+    DEFAULT_DEADBAND_POWER,
+    DEFAULT_DEADBAND_RELATIVE,
+    DEFAULT_DEADBAND_VOLTAGE,
+    DEFAULT_GRACE_PERIOD,
+    DEFAULT_HISTORY_HOURS,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_PROFILE,
+    DOMAIN,
+    POLLING_PROFILES,
+    PROFILE_CUSTOM,
+)
+from .coordinator import polling_intervals
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,7 +68,8 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
     """
 
-    await ESS.create(None, data[CONF_PASSWORD], data[CONF_HOST])
+    # The logged in client is kept for the setup of the entry
+    await async_get_ess(hass, data[CONF_HOST], data[CONF_PASSWORD], claim=False)
 
     # Return info that you want to store in the config entry.
     return {"title": "LG ESS"}
@@ -46,6 +84,12 @@ class EssConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 2
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return EssOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -85,3 +129,174 @@ class EssConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self.discovery_schema = _ess_schema(host)
 
         return await self.async_step_user()
+
+    async def async_step_reauth(
+        self, entry_data: Mapping[str, Any]
+    ) -> ConfigFlowResult:
+        """Handle a password the device rejected."""
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Ask for the new password."""
+        errors: dict[str, str] = {}
+        entry = self.hass.config_entries.async_get_entry(self.context["entry_id"])
+        assert entry is not None
+        if user_input is not None:
+            data = {**entry.data, CONF_PASSWORD: user_input[CONF_PASSWORD]}
+            try:
+                await validate_input(self.hass, data)
+                return self.async_update_reload_and_abort(entry, data=data)
+            except ESSAuthException:
+                _LOGGER.exception("Wrong password")
+                errors["base"] = "invalid_auth"
+            except ESSException:
+                _LOGGER.exception("Generic error setting up the ESS Api")
+                errors["base"] = "unknown"
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Unexpected exception")
+                errors["base"] = "unknown"
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema({vol.Required(CONF_PASSWORD): str}),
+            description_placeholders={CONF_HOST: entry.data[CONF_HOST]},
+            errors=errors,
+        )
+
+
+class EssOptionsFlow(OptionsFlow):
+    """Handle the options of LG ESS."""
+
+    def __init__(self) -> None:
+        """Initialize the options flow."""
+        self._options: dict[str, Any] = {}
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the polling profile."""
+        if user_input is not None:
+            self._options = user_input
+            if user_input[CONF_PROFILE] == PROFILE_CUSTOM:
+                return await self.async_step_custom()
+            return await self.async_step_deadband()
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_PROFILE,
+                        default=options.get(CONF_PROFILE, DEFAULT_PROFILE),
+                    ): SelectSelector(
+                        SelectSelectorConfig(
+                            options=[*POLLING_PROFILES, PROFILE_CUSTOM],
+                            mode=SelectSelectorMode.DROPDOWN,
+                            translation_key=CONF_PROFILE,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_ADAPTIVE_POLLING,
+                        default=options.get(CONF_ADAPTIVE_POLLING, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_MAX_INTERVAL,
+                        default=options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10, max=3600)),
+                    vol.Required(
+                        CONF_AGGREGATION_WINDOW,
+                        default=options.get(
+                            CONF_AGGREGATION_WINDOW, DEFAULT_AGGREGATION_WINDOW
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Required(
+                        CONF_HISTORY_HOURS,
+                        default=options.get(CONF_HISTORY_HOURS, DEFAULT_HISTORY_HOURS),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=24)),
+                    vol.Required(
+                        CONF_GRACE_PERIOD,
+                        default=options.get(CONF_GRACE_PERIOD, DEFAULT_GRACE_PERIOD),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Required(
+                        CONF_EXTERNAL_STATISTICS,
+                        default=options.get(CONF_EXTERNAL_STATISTICS, False),
+                    ): bool,
+                }
+            ),
+        )
+
+    async def async_step_custom(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage custom intervals per coordinator."""
+        if user_input is not None:
+            self._options |= user_input
+            return await self.async_step_deadband()
+
+        home, common, system = polling_intervals(self.config_entry.options)
+        return self.async_show_form(
+            step_id="custom",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_HOME_INTERVAL, default=int(home.total_seconds())
+                    ): vol.All(vol.Coerce(int), vol.Range(min=2, max=3600)),
+                    vol.Required(
+                        CONF_COMMON_INTERVAL, default=int(common.total_seconds())
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                    vol.Required(
+                        CONF_SYSTEMINFO_INTERVAL,
+                        default=int(system.total_seconds() // 3600),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=168)),
+                }
+            ),
+        )
+
+    async def async_step_deadband(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the smallest changes of measurements that are written."""
+        if user_input is not None:
+            return self.async_create_entry(data=self._options | user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="deadband",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_DEADBAND_POWER,
+                        default=options.get(
+                            CONF_DEADBAND_POWER, DEFAULT_DEADBAND_POWER
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1000)),
+                    vol.Required(
+                        CONF_DEADBAND_VOLTAGE,
+                        default=options.get(
+                            CONF_DEADBAND_VOLTAGE, DEFAULT_DEADBAND_VOLTAGE
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=50)),
+                    vol.Required(
+                        CONF_DEADBAND_CURRENT,
+                        default=options.get(
+                            CONF_DEADBAND_CURRENT, DEFAULT_DEADBAND_CURRENT
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
+                    vol.Required(
+                        CONF_DEADBAND_RELATIVE,
+                        default=options.get(
+                            CONF_DEADBAND_RELATIVE, DEFAULT_DEADBAND_RELATIVE
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=50)),
+                    vol.Required(
+                        CONF_DEADBAND_MAX_AGE,
+                        default=options.get(
+                            CONF_DEADBAND_MAX_AGE, DEFAULT_DEADBAND_MAX_AGE
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10, max=3600)),
+                }
+            ),
+        )
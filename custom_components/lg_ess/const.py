@@ -1,3 +1,89 @@
 """Constants for the LG ESS Inverter integration."""
 
 DOMAIN = "lg_ess"
+
+# A single value in a payload: (group, key), group is None for top level values
+EssKey = tuple[str | None, str]
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_DURATION = "duration"
+ATTR_INTERVAL = "interval"
+ATTR_METRICS = "metrics"
+
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_AGGREGATION_WINDOW = "aggregation_window"
+CONF_COMMON_INTERVAL = "common_interval"
+CONF_DEADBAND_CURRENT = "deadband_current"
+CONF_DEADBAND_MAX_AGE = "deadband_max_age"
+CONF_DEADBAND_POWER = "deadband_power"
+CONF_DEADBAND_RELATIVE = "deadband_relative"
+CONF_DEADBAND_VOLTAGE = "deadband_voltage"
+CONF_EXTERNAL_STATISTICS = "external_statistics"
+CONF_GRACE_PERIOD = "grace_period"
+CONF_HISTORY_HOURS = "history_hours"
+CONF_HOME_INTERVAL = "home_interval"
+CONF_MAX_INTERVAL = "max_interval"
+CONF_PROFILE = "profile"
+CONF_SYSTEMINFO_INTERVAL = "systeminfo_interval"
+
+# Seconds between two polls of the home and common data
+DEFAULT_HOME_INTERVAL = 10
+DEFAULT_COMMON_INTERVAL = 30
+# Upper bound in seconds for adaptive polling
+DEFAULT_MAX_INTERVAL = 120
+# Seconds over which the home power readings are aggregated, 0 disables it
+DEFAULT_AGGREGATION_WINDOW = 0
+# Hours of readings kept in memory per coordinator, 0 disables the history
+DEFAULT_HISTORY_HOURS = 1
+# Seconds of failed polls during which the last data is kept, 0 disables it
+DEFAULT_GRACE_PERIOD = 120
+# Hours between two safety polls of the system info
+DEFAULT_SYSTEMINFO_INTERVAL = 6
+
+# Smallest change of a measurement that is written to the state machine
+DEFAULT_DEADBAND_POWER = 10
+DEFAULT_DEADBAND_VOLTAGE = 1.0
+DEFAULT_DEADBAND_CURRENT = 0.1
+# Percent of the last written value, 0 disables the relative deadband
+DEFAULT_DEADBAND_RELATIVE = 0
+# Seconds after which a change within the deadband is written anyway
+DEFAULT_DEADBAND_MAX_AGE = 300
+
+PROFILE_LOW_LOAD = "low_load"
+PROFILE_BALANCED = "balanced"
+PROFILE_REALTIME = "realtime"
+PROFILE_CUSTOM = "custom"
+
+DEFAULT_PROFILE = PROFILE_BALANCED
+
+# Home and common intervals in seconds, system info interval in hours
+POLLING_PROFILES = {
+    PROFILE_LOW_LOAD: {
+        CONF_HOME_INTERVAL: 30,
+        CONF_COMMON_INTERVAL: 120,
+        CONF_SYSTEMINFO_INTERVAL: 24,
+    },
+    PROFILE_BALANCED: {
+        CONF_HOME_INTERVAL: DEFAULT_HOME_INTERVAL,
+        CONF_COMMON_INTERVAL: DEFAULT_COMMON_INTERVAL,
+        CONF_SYSTEMINFO_INTERVAL: DEFAULT_SYSTEMINFO_INTERVAL,
+    },
+    PROFILE_REALTIME: {
+        CONF_HOME_INTERVAL: 5,
+        CONF_COMMON_INTERVAL: 15,
+        CONF_SYSTEMINFO_INTERVAL: DEFAULT_SYSTEMINFO_INTERVAL,
+    },
+}
+
+# Sent when a config entry unloads, formatted with the entry id
+SIGNAL_ENTRY_UNLOADED = f"{DOMAIN}_entry_unloaded_{{}}"
+
+SERVICE_GET_HISTORY = "get_history"
+SERVICE_REFRESH_SYSTEMINFO = "refresh_systeminfo"
+SERVICE_START_LIVE_MODE = "start_live_mode"
+SERVICE_STOP_LIVE_MODE = "stop_live_mode"
+
+# Live mode polls the home data every few seconds for a limited time
+DEFAULT_LIVE_DURATION = 300
+DEFAULT_LIVE_INTERVAL = 2
+MAX_LIVE_DURATION = 3600
@@ -1,23 +1,278 @@
 """Coordinator to fetch the data once for all sensors."""
 
-from datetime import timedelta
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
 import logging
+import math
+import time
+from typing import Any
 
-from pyess.aio_ess import ESS
+import aiohttp
+from pyess.aio_ess import ESSAuthException, ESSException
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.const import (
+    PERCENTAGE,
+    UnitOfElectricCurrent,
+    UnitOfElectricPotential,
+    UnitOfFrequency,
+    UnitOfPower,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .client import CircuitOpenError, PooledESS
+from .const import (
+    CONF_COMMON_INTERVAL,
+    CONF_DEADBAND_CURRENT,
+    CONF_DEADBAND_MAX_AGE,
+    CONF_DEADBAND_POWER,
+    CONF_DEADBAND_RELATIVE,
+    CONF_DEADBAND_VOLTAGE,
+    CONF_HOME_INTERVAL,
+    CONF_PROFILE,
+    CONF_SYSTEMINFO_INTERVAL,
+    DEFAULT_DEADBAND_CURRENT,
+    DEFAULT_DEADBAND_MAX_AGE,
+    DEFAULT_DEADBAND_POWER,
+    DEFAULT_DEADBAND_RELATIVE,
+    DEFAULT_DEADBAND_VOLTAGE,
+    DEFAULT_PROFILE,
+    DOMAIN,
+    POLLING_PROFILES,
+    PROFILE_CUSTOM,
+    EssKey,
+)
+from .counters import EnergyCounters
+from .flows import DERIVED, METRICS, derive_flows
+from .history import ReadingBuffer
 
 _LOGGER = logging.getLogger(__name__)
 
+# Parses a raw string of the payload, raises ValueError if it is malformed
+type Decoder = Callable[[str], Any]
+
+# Receives a decoded poll and the values that changed since the last one
+type SampleCallback = Callable[[Mapping[EssKey, Any], Mapping[EssKey, Any]], None]
+
+_MISSING = object()
+
+STORAGE_VERSION = 1
+
+# Share of the poll interval a fetch may take, so a fetch always ends before
+# the next poll is due. The minimum only guards against tiny intervals.
+DEADLINE_RATIO = 0.8
+DEADLINE_MIN = 0.5
+DEADLINE_MAX = 30
+
+# Polling interval while aggregating, unless the configured one is shorter
+WINDOW_SAMPLE_INTERVAL = timedelta(seconds=2)
+
+# Pseudo key for listeners of the effective polling interval
+INTERVAL_KEY: EssKey = (None, "update_interval")
+# Pseudo key changed by every successful poll, for listeners of polled_at
+POLLED_KEY: EssKey = (None, "polled_at")
+
+# A power change above both limits counts as activity
+_ACTIVITY_WATT = 100
+_ACTIVITY_RATIO = 0.2
+# Below this the system is considered idle
+_IDLE_WATT = 10
+# Growth of the interval per quiet poll
+_WIDEN_FLAT = 1.5
+_WIDEN_IDLE = 2.0
+
+# Upper bound of the rows of the history of a coordinator, one row per poll
+HISTORY_MAX_ROWS = 50_000
+
+# Deadbands of the units without an option
+_DEADBAND_FREQUENCY = 0.05
+_DEADBAND_PERCENT = 0.5
+
+
+def flatten(data: dict[str, Any]) -> dict[EssKey, Any]:
+    """Flatten a payload into a dict keyed by (group, key)."""
+    flat: dict[EssKey, Any] = {}
+    for group, values in data.items():
+        if isinstance(values, dict):
+            for key, value in values.items():
+                flat[(group, key)] = value
+        else:
+            flat[(None, group)] = values
+    return flat
+
+
+def _number(raw: str) -> int | float:
+    try:
+        return int(raw)
+    except ValueError:
+        value = float(raw)
+    if not math.isfinite(value):
+        raise ValueError(f"not a finite number: {raw!r}")
+    return value
+
+
+def _bool(raw: str) -> bool:
+    if raw in ("on", "true", "1"):
+        return True
+    if raw in ("off", "false", "0"):
+        return False
+    raise ValueError(f"not a boolean: {raw!r}")
+
+
+def _date(raw: str) -> date:
+    return datetime.strptime(raw, "%Y-%m-%d").date()
+
+
+def _decoders(decoder: Decoder, group: str | None, *keys: str) -> dict[EssKey, Decoder]:
+    return {(group, key): decoder for key in keys}
+
+
+def min_key(key: EssKey) -> EssKey:
+    """Return the key of the minimum of a value over the aggregation window."""
+    return (key[0], f"{key[1]}_min")
+
+
+def max_key(key: EssKey) -> EssKey:
+    """Return the key of the maximum of a value over the aggregation window."""
+    return (key[0], f"{key[1]}_max")
+
+
+class _Aggregate:
+    """Running mean, minimum and maximum of the samples of one value."""
 
-class ESSCoordinator(DataUpdateCoordinator):
-    """LG ESS basic coordinator."""
+    __slots__ = ("count", "maximum", "minimum", "total")
 
-    _ess: ESS
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = float("-inf")
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+
+def _as_float(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def polling_intervals(
+    options: Mapping[str, Any],
+) -> tuple[timedelta, timedelta, timedelta]:
+    """Return the home, common and system info intervals of the options."""
+    profile = options.get(CONF_PROFILE, DEFAULT_PROFILE)
+    values = POLLING_PROFILES[DEFAULT_PROFILE]
+    if profile == PROFILE_CUSTOM:
+        values = {key: options.get(key, value) for key, value in values.items()}
+    elif profile in POLLING_PROFILES:
+        values = POLLING_PROFILES[profile]
+    return (
+        timedelta(seconds=values[CONF_HOME_INTERVAL]),
+        timedelta(seconds=values[CONF_COMMON_INTERVAL]),
+        timedelta(hours=values[CONF_SYSTEMINFO_INTERVAL]),
+    )
+
+
+@dataclass(frozen=True)
+class Deadband:
+    """Changes of measurements too small to be written to the state machine."""
+
+    # Absolute deadband by unit of measurement
+    absolute: Mapping[str, float]
+    # Share of the last written value
+    relative: float
+    # Seconds after which a change within the deadband is written anyway
+    max_age: float
+
+    def suppresses(self, unit: str, old: float, new: float, age: float) -> bool:
+        """Return if the change from old to new stays within the deadband."""
+        if age >= self.max_age or new == old:
+            return False
+        if new * old <= 0:
+            # Always write when a flow starts, stops or changes its direction
+            return False
+        band = max(self.absolute.get(unit, 0), abs(old) * self.relative)
+        return abs(new - old) < band
+
+
+def deadband(options: Mapping[str, Any]) -> Deadband:
+    """Return the deadband of the options."""
+    return Deadband(
+        absolute={
+            UnitOfPower.WATT: options.get(CONF_DEADBAND_POWER, DEFAULT_DEADBAND_POWER),
+            UnitOfElectricPotential.VOLT: options.get(
+                CONF_DEADBAND_VOLTAGE, DEFAULT_DEADBAND_VOLTAGE
+            ),
+            UnitOfElectricCurrent.AMPERE: options.get(
+                CONF_DEADBAND_CURRENT, DEFAULT_DEADBAND_CURRENT
+            ),
+            UnitOfFrequency.HERTZ: _DEADBAND_FREQUENCY,
+            PERCENTAGE: _DEADBAND_PERCENT,
+        },
+        relative=options.get(CONF_DEADBAND_RELATIVE, DEFAULT_DEADBAND_RELATIVE) / 100,
+        max_age=options.get(CONF_DEADBAND_MAX_AGE, DEFAULT_DEADBAND_MAX_AGE),
+    )
+
+
+def systeminfo_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store caching the system info of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.systeminfo.{entry_id}")
+
+
+class ESSCoordinator(DataUpdateCoordinator, ABC):
+    """LG ESS basic coordinator.
+
+    Entities subscribe with a context of the (group, key) pairs they read.
+    After each poll only the listeners whose keys changed are notified.
+
+    With adaptive polling the interval widens up to a maximum while the
+    power readings in _power_keys are flat, and falls back to the configured
+    interval as soon as they jump or one of the _flag_keys flips.
+
+    The device sends every value as a string. Each poll is decoded once into
+    the typed snapshot following _schema, values missing from the schema
+    are kept as strings. Malformed values become None and are logged once.
+    Values derived from the decoded snapshot are added by _derive in the
+    same pass.
+
+    Live mode polls at a short interval for a limited time. Meanwhile only
+    the listeners of _live_keys are notified, the other changes are held
+    back until live mode ends.
+
+    With an aggregation window the device is sampled every
+    WINDOW_SAMPLE_INTERVAL. The mean, minimum and maximum of the _window_keys
+    are published once per window together with the other values, the
+    samples in between only reach the history and the sample subscribers.
+
+    A failed poll keeps the last data for up to grace_period, so a short
+    outage does not take every entity unavailable and back. The time of the
+    poll the data comes from is kept in polled_at.
+    """
+
+    _ess: PooledESS
+    _schema: Mapping[EssKey, Decoder] = {}
+    _power_keys: tuple[EssKey, ...] = ()
+    _flag_keys: tuple[EssKey, ...] = ()
+    _live_keys: frozenset[EssKey] = frozenset()
+    _window_keys: tuple[EssKey, ...] = ()
+    # Offset in seconds of the polls within a second, keeps the coordinators
+    # of a device from polling at the same moment
+    _phase = 0.0
 
     def __init__(
-        self, hass: HomeAssistant, ess: ESS, name: str, interval: timedelta
+        self, hass: HomeAssistant, ess: PooledESS, name: str, interval: timedelta
     ) -> None:
         """Initialize my coordinator."""
         super().__init__(
@@ -25,8 +280,368 @@ class ESSCoordinator(DataUpdateCoordinator):
             _LOGGER,
             name=name,
             update_interval=interval,
+            # Skip the dispatch entirely if the payload did not change
+            always_update=False,
         )
         self._ess = ess
+        # DataUpdateCoordinator polls at a random offset within the second,
+        # kept in the private _microsecond (as of Home Assistant 2025.1). It
+        # is only replaced while it still exists as a float, otherwise the
+        # polls keep the random offset.
+        if isinstance(getattr(self, "_microsecond", None), float):
+            self._microsecond = self._phase
+        else:
+            _LOGGER.debug("Polling %s at a random offset", name)
+        self.snapshot: dict[EssKey, Any] = {}
+        self._malformed: set[EssKey] = set()
+        self._changed: set[EssKey] | None = None
+        self._dispatched_success = True
+        self._base_interval = interval
+        self._max_interval: timedelta | None = None
+        self._live_interval: timedelta | None = None
+        self._cancel_live: CALLBACK_TYPE | None = None
+        self._deferred: set[EssKey] = set()
+        self._window: timedelta | None = None
+        self._window_start = 0.0
+        self._aggregates: dict[EssKey, _Aggregate] = {}
+        # Numeric values of the recent polls, before aggregation
+        self.history: ReadingBuffer | None = None
+        # Last decoded poll before aggregation and its subscribers
+        self.sample: dict[EssKey, Any] = {}
+        self._sample_callbacks: list[SampleCallback] = []
+        # Applied by the measurement sensors of this coordinator
+        self.deadband = deadband({})
+        self.grace_period = timedelta(0)
+        self.polled_at: datetime | None = None
+        self._failing_since: float | None = None
+        # If the last poll was a sample within the aggregation window
+        self._holding = False
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        try:
+            data = await self._async_poll()
+        except UpdateFailed as err:
+            now = time.monotonic()
+            if self._failing_since is None:
+                self._failing_since = now
+            if self.data is None or now - self._failing_since >= (
+                self.grace_period.total_seconds()
+            ):
+                raise
+            _LOGGER.debug(
+                "Keeping the data of %s polled at %s: %s",
+                self.name,
+                self.polled_at,
+                err,
+            )
+            # Unchanged data is not dispatched, the entities keep their state
+            self.always_update = False
+            return self.data
+        self._failing_since = None
+        self.always_update = True
+        if self._holding:
+            # A sample within the aggregation window publishes nothing
+            return data
+        self.polled_at = dt_util.utcnow()
+        # Dispatch on the decoded snapshot, not the raw payload: a closing
+        # aggregation window changes the snapshot of an unchanged payload.
+        # The listeners of polled_at follow every successful poll.
+        assert self._changed is not None
+        self._changed.add(POLLED_KEY)
+        return data
+
+    async def _async_poll(self) -> dict[str, Any]:
+        breaker = self._ess.breaker
+        try:
+            breaker.async_before_request()
+        except CircuitOpenError as err:
+            raise UpdateFailed(str(err)) from err
+        # Give up before the next poll is due instead of piling up requests.
+        # Live mode bounds the fetch by the live interval, not the configured
+        # one, so a slow device skips live polls instead of delaying them.
+        # The deadline applies to the request, not to the wait for the lock
+        # of the device, which would blame the device for another request.
+        interval = self._live_interval or self._polling_interval
+        deadline = max(
+            min(interval.total_seconds() * DEADLINE_RATIO, DEADLINE_MAX), DEADLINE_MIN
+        )
+        try:
+            data = await self._async_fetch(deadline)
+        except ESSAuthException as err:
+            # The single login after an expired auth key was rejected
+            breaker.async_release()
+            raise ConfigEntryAuthFailed from err
+        except (TimeoutError, aiohttp.ClientError, ESSException) as err:
+            breaker.async_failure()
+            raise UpdateFailed(f"Error fetching {self.name}: {err!r}") from err
+        except BaseException:
+            breaker.async_release()
+            raise
+        breaker.async_success()
+
+        snapshot = self._decode(data)
+        if self.history is not None:
+            self.history.append(time.time(), snapshot)
+        self._async_publish_sample(snapshot)
+        previous = self.snapshot
+        self._holding = (
+            self._window is not None and not self.live and not self._aggregate(snapshot)
+        )
+        if self._holding:
+            snapshot = previous
+        self._changed = {
+            key
+            for key in snapshot.keys() | previous.keys()
+            if snapshot.get(key, _MISSING) != previous.get(key, _MISSING)
+        }
+        self.snapshot = snapshot
+        if (
+            self._max_interval is not None
+            and previous
+            and not self.live
+            and self._window is None
+        ):
+            self._async_adapt_interval(previous, snapshot)
+        return data
+
+    @abstractmethod
+    async def _async_fetch(self, timeout: float) -> dict[str, Any]:
+        """Fetch the raw payload from the device within timeout seconds."""
+
+    def _decode(self, data: dict[str, Any]) -> dict[EssKey, Any]:
+        """Decode the raw payload into the typed snapshot."""
+        snapshot = flatten(data)
+        for key, decoder in self._schema.items():
+            raw = snapshot.get(key)
+            if raw is None:
+                continue
+            if isinstance(raw, str) and not raw.strip():
+                # Not reported by this device
+                snapshot[key] = None
+                continue
+            try:
+                snapshot[key] = decoder(raw)
+            except (TypeError, ValueError) as err:
+                snapshot[key] = None
+                if key not in self._malformed:
+                    self._malformed.add(key)
+                    _LOGGER.warning(
+                        "Malformed value %r of %s in %s: %s", raw, key, self.name, err
+                    )
+            else:
+                self._malformed.discard(key)
+        snapshot.update(self._derive(snapshot))
+        return snapshot
+
+    def _derive(self, snapshot: Mapping[EssKey, Any]) -> Mapping[EssKey, Any]:
+        """Compute the derived values of a decoded snapshot."""
+        return {}
+
+    @callback
+    def async_set_polling(
+        self, interval: timedelta, max_interval: timedelta | None
+    ) -> None:
+        """Set the polling interval and the upper bound for adaptive polling."""
+        self._base_interval = interval
+        if max_interval is not None and max_interval <= interval:
+            max_interval = None
+        self._max_interval = max_interval
+        if not self.live:
+            self._async_apply_interval(self._polling_interval)
+
+    @property
+    def _polling_interval(self) -> timedelta:
+        """Return the interval to poll at outside of live mode."""
+        if self._window is None:
+            return self._base_interval
+        return min(self._base_interval, WINDOW_SAMPLE_INTERVAL)
+
+    @callback
+    def async_subscribe_samples(self, sample_callback: SampleCallback) -> CALLBACK_TYPE:
+        """Call sample_callback with each decoded poll and its changed values.
+
+        Unlike the listeners, samples bypass the aggregation window and the
+        live mode filter.
+        """
+        self._sample_callbacks.append(sample_callback)
+
+        @callback
+        def _async_unsubscribe() -> None:
+            self._sample_callbacks.remove(sample_callback)
+
+        return _async_unsubscribe
+
+    @callback
+    def _async_publish_sample(self, sample: dict[EssKey, Any]) -> None:
+        previous, self.sample = self.sample, dict(sample)
+        if not self._sample_callbacks:
+            return
+        changed = {
+            key: value
+            for key, value in sample.items()
+            if previous.get(key, _MISSING) != value
+        }
+        for sample_callback in list(self._sample_callbacks):
+            sample_callback(self.sample, changed)
+
+    @callback
+    def async_set_history(self, duration: timedelta | None) -> None:
+        """Keep the numeric values of the polls of the last duration in memory."""
+        if duration is None:
+            self.history = None
+            return
+        capacity = min(math.ceil(duration / self._polling_interval), HISTORY_MAX_ROWS)
+        if self.history is None:
+            self.history = ReadingBuffer(capacity)
+        elif capacity != self.history.capacity:
+            self.history = self.history.resized(capacity)
+
+    @callback
+    def async_set_window(self, window: timedelta | None) -> None:
+        """Publish the mean, minimum and maximum over window instead of samples."""
+        if window == self._window:
+            return
+        self._window = window
+        self._aggregates = {}
+        self._window_start = time.monotonic()
+        if not self.live:
+            self._async_apply_interval(self._polling_interval)
+
+    def _aggregate(self, snapshot: dict[EssKey, Any]) -> bool:
+        """Add the samples of a poll, return if the window closed.
+
+        A closing window replaces the samples in snapshot by the aggregates.
+        """
+        for key in self._window_keys:
+            value = snapshot.get(key)
+            if isinstance(value, int | float) and not isinstance(value, bool):
+                if (aggregate := self._aggregates.get(key)) is None:
+                    aggregate = self._aggregates[key] = _Aggregate()
+                aggregate.add(value)
+
+        assert self._window is not None
+        now = time.monotonic()
+        if self.snapshot and now - self._window_start < self._window.total_seconds():
+            return False
+
+        for key in self._window_keys:
+            if (aggregate := self._aggregates.get(key)) is None:
+                snapshot[key] = snapshot[min_key(key)] = snapshot[max_key(key)] = None
+                continue
+            snapshot[key] = round(aggregate.total / aggregate.count, 1)
+            snapshot[min_key(key)] = aggregate.minimum
+            snapshot[max_key(key)] = aggregate.maximum
+        self._aggregates = {}
+        self._window_start = now
+        return True
+
+    @property
+    def live(self) -> bool:
+        """Return if live mode is running."""
+        return self._live_interval is not None
+
+    @callback
+    def async_start_live(self, interval: timedelta, duration: timedelta) -> None:
+        """Poll at interval for duration, then return to the configured polling."""
+        if self._cancel_live is not None:
+            self._cancel_live()
+        self._cancel_live = async_call_later(
+            self.hass, duration, self._async_live_expired
+        )
+        self._live_interval = interval
+        _LOGGER.debug("Live mode of %s for %s", self.name, duration)
+        self._async_apply_interval(interval)
+
+    @callback
+    def async_stop_live(self) -> None:
+        """End live mode before its duration is over."""
+        if self._cancel_live is None:
+            return
+        self._cancel_live()
+        self._cancel_live = None
+        self._async_end_live()
+
+    @callback
+    def _async_live_expired(self, _now: datetime) -> None:
+        self._cancel_live = None
+        self._async_end_live()
+
+    @callback
+    def _async_end_live(self) -> None:
+        self._live_interval = None
+        self._async_apply_interval(self._polling_interval)
+        if self._deferred and self.last_update_success:
+            # Catch up on the changes held back during live mode
+            self._changed, self._deferred = self._deferred, set()
+            self.async_update_listeners()
+
+    @callback
+    def _async_apply_interval(self, interval: timedelta) -> None:
+        if interval != self.update_interval:
+            self._async_set_interval(interval)
+            if self._listeners:
+                # Apply right away instead of after the pending poll
+                self._schedule_refresh()
+
+    @callback
+    def _async_adapt_interval(
+        self, previous: dict[EssKey, Any], snapshot: dict[EssKey, Any]
+    ) -> None:
+        """Widen or reset the interval depending on the activity."""
+        assert self._max_interval is not None
+        if any(previous.get(key) != snapshot.get(key) for key in self._flag_keys):
+            self._async_set_interval(self._base_interval)
+            return
+
+        idle = True
+        for key in self._power_keys:
+            new = _as_float(snapshot.get(key))
+            old = _as_float(previous.get(key))
+            if new is None or old is None:
+                continue
+            delta = abs(new - old)
+            if delta > _ACTIVITY_WATT and delta > abs(old) * _ACTIVITY_RATIO:
+                self._async_set_interval(self._base_interval)
+                return
+            idle = idle and abs(new) < _IDLE_WATT
+
+        interval = self.update_interval * (_WIDEN_IDLE if idle else _WIDEN_FLAT)
+        self._async_set_interval(min(interval, self._max_interval))
+
+    @callback
+    def _async_set_interval(self, interval: timedelta) -> None:
+        if interval == self.update_interval:
+            return
+        _LOGGER.debug("Polling %s every %s", self.name, interval)
+        self.update_interval = interval
+        for update_callback, context in list(self._listeners.values()):
+            if context is not None and INTERVAL_KEY in context:
+                update_callback()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only the listeners whose keys changed since the last poll."""
+        changed, self._changed = self._changed, None
+        if (
+            changed is None
+            or not self.last_update_success
+            or not self._dispatched_success
+        ):
+            # Availability changed or data was set from outside a poll
+            self._dispatched_success = self.last_update_success
+            self._deferred.clear()
+            super().async_update_listeners()
+            return
+
+        if self.live:
+            self._deferred |= changed - self._live_keys
+            changed &= self._live_keys
+        elif self._deferred:
+            changed |= self._deferred
+            self._deferred.clear()
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or not changed.isdisjoint(context):
+                update_callback()
 
 
 class CommonCoordinator(ESSCoordinator):
@@ -58,17 +673,107 @@ class CommonCoordinator(ESSCoordinator):
             'pcs_stauts': '3', 'feed_in_limitation': '100', 'operation_mode': '0'}}
     """
 
-    def __init__(self, hass: HomeAssistant, ess: ESS) -> None:
+    _power_keys = (
+        ("PV", "pv1_power"),
+        ("PV", "pv2_power"),
+        ("PV", "pv3_power"),
+        ("BATT", "dc_power"),
+        ("GRID", "active_power"),
+        ("LOAD", "load_power"),
+    )
+    _flag_keys = (("BATT", "status"),)
+    _schema = {
+        **_decoders(
+            _number,
+            "PV",
+            "capacity",
+            "pv1_voltage",
+            "pv2_voltage",
+            "pv3_voltage",
+            "pv1_power",
+            "pv2_power",
+            "pv3_power",
+            "pv1_current",
+            "pv2_current",
+            "pv3_current",
+            "today_pv_generation_sum",
+            "today_month_pv_generation_sum",
+        ),
+        **_decoders(
+            _number,
+            "BATT",
+            "soc",
+            "dc_power",
+            "safety_soc",
+            "backup_soc",
+            "today_batt_discharge_enery",
+            "today_batt_charge_energy",
+            "month_batt_charge_energy",
+            "month_batt_discharge_energy",
+        ),
+        **_decoders(
+            _bool,
+            "BATT",
+            "winter_setting",
+            "winter_status",
+            "backup_setting",
+            "backup_status",
+        ),
+        **_decoders(
+            _number,
+            "GRID",
+            "active_power",
+            "a_phase",
+            "freq",
+            "today_grid_feed_in_energy",
+            "today_grid_power_purchase_energy",
+            "month_grid_feed_in_energy",
+            "month_grid_power_purchase_energy",
+        ),
+        **_decoders(
+            _number,
+            "LOAD",
+            "load_power",
+            "today_load_consumption_sum",
+            "today_pv_direct_consumption_enegy",
+            "today_batt_discharge_enery",
+            "today_grid_power_purchase_energy",
+            "month_load_consumption_sum",
+            "month_pv_direct_consumption_energy",
+            "month_batt_discharge_energy",
+            "month_grid_power_purchase_energy",
+        ),
+        **_decoders(
+            _number,
+            "PCS",
+            "today_self_consumption",
+            "month_co2_reduction_accum",
+            "today_pv_generation_sum",
+            "today_grid_feed_in_energy",
+            "month_pv_generation_sum",
+            "month_grid_feed_in_energy",
+            "feed_in_limitation",
+        ),
+    }
+    _phase = 0.45
+
+    def __init__(
+        self, hass: HomeAssistant, ess: PooledESS, entry_id: str, interval: timedelta
+    ) -> None:
         """Initialize my coordinator."""
         super().__init__(
             hass,
             ess,
             name="LG ESS common",
-            interval=timedelta(seconds=30),
+            interval=interval,
         )
+        self.counters = EnergyCounters(hass, entry_id)
 
-    async def _async_update_data(self):
-        return await self._ess.get_common()
+    async def _async_fetch(self, timeout: float) -> dict[str, Any]:
+        return await self._ess.get_state("common", timeout)
+
+    def _derive(self, snapshot: Mapping[EssKey, Any]) -> Mapping[EssKey, Any]:
+        return self.counters.async_update(snapshot)
 
 
 class SystemInfoCoordinator(ESSCoordinator):
@@ -83,17 +788,58 @@ class SystemInfoCoordinator(ESSCoordinator):
         'bms_version': 'BMS 02.03.00.04 / DCDC 16.11.0.0 ', 'bms_unit1_version': 'BMS 02.03.00.04 / DCDC 16.11.0.0 ', 'bms_unit2_version': ' '}}
     """
 
-    def __init__(self, hass: HomeAssistant, ess: ESS) -> None:
+    _schema = {
+        **_decoders(_number, "pms", "ac_input_power", "ac_output_power"),
+        **_decoders(_date, "pms", "install_date"),
+        **_decoders(
+            _number, "batt", "capacity", "hbc_cycle_count_1", "hbc_cycle_count_2"
+        ),
+        **_decoders(_date, "batt", "install_date"),
+    }
+    _phase = 0.8
+
+    def __init__(
+        self, hass: HomeAssistant, ess: PooledESS, entry_id: str, interval: timedelta
+    ) -> None:
         """Initialize my coordinator."""
         super().__init__(
             hass,
             ess,
             name="LG ESS system info",
-            interval=timedelta(minutes=10),
+            interval=interval,
         )
+        self._store = systeminfo_store(hass, entry_id)
+
+    @callback
+    def async_watch(
+        self, coordinator: ESSCoordinator, keys: tuple[EssKey, ...]
+    ) -> CALLBACK_TYPE:
+        """Refresh the system info when one of the keys of coordinator changes.
+
+        The system info only changes with firmware updates or hardware swaps,
+        which also show up in the status fields of the frequent polls.
+        """
+
+        @callback
+        def _async_changed() -> None:
+            _LOGGER.debug("Status of %s changed, refreshing", coordinator.name)
+            self.hass.async_create_task(self.async_request_refresh())
 
-    async def _async_update_data(self):
-        return await self._ess.get_systeminfo()
+        return coordinator.async_add_listener(_async_changed, keys)
+
+    async def async_load_cache(self) -> bool:
+        """Use the last stored system info as data until the device answers."""
+        if (cached := await self._store.async_load()) is None:
+            return False
+        self.data = cached
+        self.snapshot = self._decode(cached)
+        return True
+
+    async def _async_fetch(self, timeout: float) -> dict[str, Any]:
+        data = await self._ess.get_state("systeminfo", timeout)
+        if data != self.data:
+            await self._store.async_save(data)
+        return data
 
 
 class HomeCoordinator(ESSCoordinator):
@@ -120,14 +866,84 @@ class HomeCoordinator(ESSCoordinator):
     'gridWaitingTime': '0'}
     """
 
-    def __init__(self, hass: HomeAssistant, ess: ESS) -> None:
+    _power_keys = (
+        ("statistics", "pcs_pv_total_power"),
+        ("statistics", "batconv_power"),
+        ("statistics", "load_power"),
+        ("statistics", "grid_power"),
+    )
+    _flag_keys = (
+        ("direction", "is_direct_consuming_"),
+        ("direction", "is_battery_charging_"),
+        ("direction", "is_battery_discharging_"),
+        ("direction", "is_grid_selling_"),
+        ("direction", "is_grid_buying_"),
+        ("direction", "is_charging_from_grid_"),
+        ("direction", "is_discharging_to_grid_"),
+    )
+    _schema = {
+        **_decoders(
+            _number,
+            "statistics",
+            "pcs_pv_total_power",
+            "batconv_power",
+            "bat_status",
+            "bat_user_soc",
+            "load_power",
+            "ac_output_power",
+            "load_today",
+            "grid_power",
+            "current_day_self_consumption",
+            "current_pv_generation_sum",
+            "current_grid_feed_in_energy",
+        ),
+        **_decoders(_bool, "statistics", "bat_use"),
+        **_decoders(_bool, "direction", *(key for _, key in _flag_keys)),
+        **_decoders(
+            _number, "operation", "mode", "drm_mode0", "remote_mode", "drm_control"
+        ),
+        **_decoders(_bool, "operation", "pcs_standbymode"),
+        **_decoders(_bool, "wintermode", "winter_status", "backup_status"),
+        **_decoders(_number, "heatpump", "heatpump_protocol", "current_temp"),
+        **_decoders(_bool, "heatpump", "heatpump_activate", "heatpump_working"),
+        **_decoders(_bool, "evcharger", "ev_activate"),
+        **_decoders(_number, "evcharger", "ev_power"),
+        **_decoders(_number, None, "gridWaitingTime"),
+    }
+    # Power readings, flow directions and the flows derived from them
+    _live_keys = frozenset(
+        (*_power_keys, *_flag_keys, *((DERIVED, metric) for metric in METRICS))
+    )
+    _window_keys = (*_power_keys, *((DERIVED, metric) for metric in METRICS))
+    _phase = 0.1
+
+    def __init__(
+        self, hass: HomeAssistant, ess: PooledESS, interval: timedelta
+    ) -> None:
         """Initialize my coordinator."""
         super().__init__(
             hass,
             ess,
             name="LG ESS home",
-            interval=timedelta(seconds=10),
+            interval=interval,
         )
 
-    async def _async_update_data(self):
-        return await self._ess.get_home()
+    async def _async_fetch(self, timeout: float) -> dict[str, Any]:
+        return await self._ess.get_state("home", timeout)
+
+    def _derive(self, snapshot: Mapping[EssKey, Any]) -> Mapping[EssKey, Any]:
+        return derive_flows(snapshot)
+
+
+@dataclass
+class EssData:
+    """Runtime data of a config entry."""
+
+    ess: PooledESS
+    common: CommonCoordinator
+    system: SystemInfoCoordinator
+    home: HomeCoordinator
+    # Seconds spent on the first refresh of all coordinators
+    startup_duration: float
+    # Energy is written as hourly external statistics instead of entities
+    external_statistics: bool = False
@@ -0,0 +1,163 @@
+"""Lifetime energy counters built from the daily counters of the device."""
+
+from collections.abc import Mapping
+from datetime import date
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, EssKey
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Seconds the counters may be behind on disk
+SAVE_DELAY = 60
+
+# Group of the lifetime counters in the snapshot of the common coordinator
+LIFETIME = "lifetime"
+
+# Daily counter in Wh each lifetime counter is built from
+SOURCES: dict[str, EssKey] = {
+    "batt_charge_energy": ("BATT", "today_batt_charge_energy"),
+    "batt_discharge_energy": ("BATT", "today_batt_discharge_enery"),
+    "load_consumption_sum": ("LOAD", "today_load_consumption_sum"),
+    "pv_direct_consumption_energy": ("LOAD", "today_pv_direct_consumption_enegy"),
+    "grid_power_purchase_energy": ("LOAD", "today_grid_power_purchase_energy"),
+    "pv_generation_sum": ("PCS", "today_pv_generation_sum"),
+    "grid_feed_in_energy": ("PCS", "today_grid_feed_in_energy"),
+}
+
+# Monthly counter in Wh of the same energy, covers the polls missed at midnight
+MONTH_SOURCES: dict[str, EssKey] = {
+    "batt_charge_energy": ("BATT", "month_batt_charge_energy"),
+    "batt_discharge_energy": ("BATT", "month_batt_discharge_energy"),
+    "load_consumption_sum": ("LOAD", "month_load_consumption_sum"),
+    "pv_direct_consumption_energy": ("LOAD", "month_pv_direct_consumption_energy"),
+    "grid_power_purchase_energy": ("LOAD", "month_grid_power_purchase_energy"),
+    "pv_generation_sum": ("PCS", "month_pv_generation_sum"),
+    "grid_feed_in_energy": ("PCS", "month_grid_feed_in_energy"),
+}
+
+# An increase faster than this power is a glitch of the device
+_MAX_WATT = 50_000
+# Minimum time in seconds the plausibility check allows for an increase
+_MIN_ELAPSED = 60
+
+
+def _number(value: Any) -> float | None:
+    if not isinstance(value, int | float) or isinstance(value, bool):
+        return None
+    return value
+
+
+def _local_date(timestamp: float) -> date:
+    return dt_util.as_local(dt_util.utc_from_timestamp(timestamp)).date()
+
+
+def counters_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store of the lifetime counters of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.counters.{entry_id}")
+
+
+class EnergyCounters:
+    """Never resetting sums of the daily energy counters.
+
+    Each counter adds the increases of its daily counter. A drop to a
+    positive value or the first reading of a new local day is the reset at
+    midnight. The polls may have missed the end of the last day, so the
+    reset adds the increase of the monthly counter since the last reading.
+    Without one it adds the new daily value, after the month changed the
+    monthly value. A drop to zero within the day is ignored: either it is a
+    glitch or the reset shows up with the next positive value. So is any
+    drop within the day the monthly counter does not follow. An increase
+    faster than _MAX_WATT is a glitch and only moves the baseline.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the counters of a config entry."""
+        self._store = counters_store(hass, entry_id)
+        self._counters: dict[str, dict[str, float]] = {}
+
+    async def async_load(self) -> None:
+        """Load the persisted counters."""
+        self._counters = await self._store.async_load() or {}
+
+    @callback
+    def async_update(self, snapshot: Mapping[EssKey, Any]) -> dict[EssKey, Any]:
+        """Add the daily counters of a decoded poll, return the lifetime values."""
+        now = dt_util.utcnow().timestamp()
+        changed = False
+        for name, source in SOURCES.items():
+            if (value := _number(snapshot.get(source))) is None:
+                continue
+            month = _number(snapshot.get(MONTH_SOURCES[name]))
+            if (counter := self._counters.get(name)) is None:
+                # Includes the energy of today until now
+                counter = self._counters[name] = {
+                    "total": value,
+                    "last": value,
+                    "updated": now,
+                }
+                if month is not None:
+                    counter["month"] = month
+                changed = True
+                continue
+            changed |= self._add(name, counter, value, month, now)
+        if changed:
+            self._store.async_delay_save(lambda: self._counters, SAVE_DELAY)
+        return {
+            (LIFETIME, name): counter["total"]
+            for name, counter in self._counters.items()
+        }
+
+    def _add(
+        self,
+        name: str,
+        counter: dict[str, float],
+        value: float,
+        month: float | None,
+        now: float,
+    ) -> bool:
+        """Add a reading to a counter, return if the counter changed."""
+        last = counter["last"]
+        new_day = _local_date(now) != _local_date(counter["updated"])
+        if new_day or value < last:
+            if not new_day and (
+                value == 0 or (month is not None and month == counter.get("month"))
+            ):
+                # A glitch, keep the last reading as the baseline
+                return False
+            _LOGGER.debug("Daily counter of %s reset from %s to %s", name, last, value)
+            increase = _reset_increase(counter, value, month)
+        elif value == last:
+            return False
+        else:
+            increase = value - last
+        elapsed = max(now - counter["updated"], _MIN_ELAPSED)
+        if increase > _MAX_WATT * elapsed / 3600:
+            _LOGGER.debug("Ignoring jump of %s from %s to %s", name, last, value)
+            increase = 0
+        counter["total"] += increase
+        counter["last"] = value
+        counter["updated"] = now
+        if month is not None:
+            counter["month"] = month
+        return True
+
+
+def _reset_increase(
+    counter: Mapping[str, float], value: float, month: float | None
+) -> float:
+    """Return the energy since the last reading across a daily reset."""
+    last_month = counter.get("month")
+    if month is None or last_month is None:
+        # Unchanged across midnight, the device did not reset yet
+        return value if value != counter["last"] else 0
+    if month < last_month:
+        # The month changed as well, only the end of the last one is lost
+        return max(month, value)
+    return month - last_month
@@ -0,0 +1,44 @@
+"""Diagnostics support for LG ESS."""
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+
+from .client import async_request_stats
+from .const import DOMAIN
+from .coordinator import EssData
+
+TO_REDACT = {CONF_PASSWORD, "serialno"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data: EssData = hass.data[DOMAIN][entry.entry_id]
+    stats = async_request_stats(hass, data.ess)
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "startup": {
+            "first_refresh_seconds": round(data.startup_duration, 3),
+        },
+        "requests": {
+            "circuit_breaker": data.ess.breaker.state,
+            "count": stats.requests,
+            "new_connections": stats.connections,
+            "last": {path: asdict(timing) for path, timing in stats.last.items()},
+        },
+        "coordinators": {
+            coordinator.name: {
+                "update_interval": coordinator.update_interval.total_seconds(),
+                "last_update_success": coordinator.last_update_success,
+                "data": async_redact_data(coordinator.data, TO_REDACT),
+            }
+            for coordinator in (data.common, data.system, data.home)
+        },
+    }
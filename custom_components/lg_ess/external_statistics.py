@@ -0,0 +1,158 @@
+"""Hourly long term statistics of the lifetime energy counters."""
+
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, EssKey
+from .counters import LIFETIME, MONTH_SOURCES, SOURCES
+
+_LOGGER = logging.getLogger(__name__)
+
+_HOUR = timedelta(hours=1)
+# Hours filled in at most after a downtime
+MAX_BACKFILL_HOURS = 31 * 24
+
+
+def statistic_id(entry_id: str, name: str) -> str:
+    """Return the id of the external statistic of a lifetime counter."""
+    return f"{DOMAIN}:{entry_id.lower()}_{name}"
+
+
+def _start_of_hour(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _interpolate(points: list[tuple[float, float]], timestamp: float) -> float:
+    """Return the value at timestamp on the line through the sorted points."""
+    for (start, low), (end, high) in zip(points, points[1:]):
+        if timestamp <= end:
+            if end == start:
+                return high
+            return low + (high - low) * (timestamp - start) / (end - start)
+    return points[-1][1]
+
+
+class HourlyStatistics:
+    """Write one statistics row per lifetime counter and hour to the recorder.
+
+    The row of an hour holds the lifetime counter at the end of the hour as
+    sum, interpolated between the last poll before and the first poll after
+    the hour ended. After a downtime or a lost connection, the hours since
+    the last poll, or since the last row in the recorder after a restart,
+    are filled in one batch. The lifetime counter covers the whole gap. The
+    daily and monthly counters tell how much of the missing energy was used
+    since midnight and since the first of the month, the rest is spread over
+    the hours before.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, title: str) -> None:
+        """Initialize the statistics of a config entry."""
+        self._hass = hass
+        self._metadata = {
+            name: StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                name=f"{title} {name.replace('_', ' ')}",
+                source=DOMAIN,
+                statistic_id=statistic_id(entry_id, name),
+                unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+            )
+            for name in SOURCES
+        }
+        # Time, lifetime counter and daily counter of the last known reading
+        self._anchors: dict[str, tuple[float, float, float | None]] = {}
+
+    async def async_load(self) -> None:
+        """Continue after the last rows in the recorder."""
+        recorder = get_instance(self._hass)
+        for name, metadata in self._metadata.items():
+            last = await recorder.async_add_executor_job(
+                get_last_statistics,
+                self._hass,
+                1,
+                metadata["statistic_id"],
+                True,
+                {"sum"},
+            )
+            if rows := last.get(metadata["statistic_id"]):
+                row = rows[0]
+                # The sum of a row is the counter at the end of its hour
+                self._anchors[name] = (
+                    row["start"] + _HOUR.total_seconds(),
+                    row["sum"],
+                    None,
+                )
+
+    @callback
+    def async_sample(
+        self, sample: Mapping[EssKey, Any], changed: Mapping[EssKey, Any]
+    ) -> None:
+        """Take the counters of a decoded poll of the common data."""
+        now = dt_util.utcnow()
+        for name, source in SOURCES.items():
+            total = sample.get((LIFETIME, name))
+            if total is None:
+                continue
+            state = sample.get(source)
+            month = sample.get(MONTH_SOURCES[name])
+            if (anchor := self._anchors.get(name)) is not None and (
+                rows := self._rows(anchor, now, total, state, month)
+            ):
+                if len(rows) > 1:
+                    _LOGGER.debug("Filling %s hours of %s", len(rows), name)
+                async_add_external_statistics(self._hass, self._metadata[name], rows)
+            self._anchors[name] = (now.timestamp(), total, state)
+
+    def _rows(
+        self,
+        anchor: tuple[float, float, float | None],
+        now: datetime,
+        total: float,
+        state: float | None,
+        month: float | None,
+    ) -> list[StatisticData]:
+        """Return the rows of the hours completed since the anchor."""
+        since, since_total, since_state = anchor
+        hour = _start_of_hour(dt_util.utc_from_timestamp(since))
+        current = _start_of_hour(now)
+        if hour >= current:
+            return []
+        hours = int((current - hour) / _HOUR)
+        if hours > MAX_BACKFILL_HOURS:
+            hour = current - MAX_BACKFILL_HOURS * _HOUR
+            hours = MAX_BACKFILL_HOURS
+
+        points = [(since, since_total)]
+        midnight = dt_util.start_of_local_day(dt_util.as_local(now))
+        for start, used in ((midnight.replace(day=1), month), (midnight, state)):
+            if (
+                since < start.timestamp()
+                and used is not None
+                and points[-1][1] <= total - used <= total
+            ):
+                points.append((start.timestamp(), total - used))
+        points.append((now.timestamp(), total))
+
+        rows = [
+            StatisticData(
+                start=start,
+                sum=round(_interpolate(points, (start + _HOUR).timestamp()), 1),
+            )
+            for start in (hour + i * _HOUR for i in range(hours))
+        ]
+        if hours == 1 and since_state is not None:
+            # The daily counter as of the last poll of the hour
+            rows[0]["state"] = since_state
+        return rows
@@ -0,0 +1,73 @@
+"""Energy flows derived from the decoded home data."""
+
+from collections.abc import Mapping
+from typing import Any
+
+# Group of the derived values in the snapshot of the home coordinator
+DERIVED = "derived"
+
+BATTERY_POWER = "battery_power"
+GRID_POWER = "grid_power"
+PV_TO_LOAD = "pv_to_load"
+PV_TO_BATTERY = "pv_to_battery"
+PV_TO_GRID = "pv_to_grid"
+BATTERY_TO_LOAD = "battery_to_load"
+BATTERY_TO_GRID = "battery_to_grid"
+GRID_TO_LOAD = "grid_to_load"
+GRID_TO_BATTERY = "grid_to_battery"
+SELF_SUFFICIENCY = "self_sufficiency"
+
+METRICS = (
+    BATTERY_POWER,
+    GRID_POWER,
+    PV_TO_LOAD,
+    PV_TO_BATTERY,
+    PV_TO_GRID,
+    BATTERY_TO_LOAD,
+    BATTERY_TO_GRID,
+    GRID_TO_LOAD,
+    GRID_TO_BATTERY,
+    SELF_SUFFICIENCY,
+)
+
+
+def derive_flows(snapshot: Mapping[Any, Any]) -> dict[tuple[str, str], Any]:
+    """Split the power readings of the home data into flows between the nodes.
+
+    PV feeds the load first, then the battery, the rest goes to the grid.
+    The battery feeds the remaining load before the grid does. The signed
+    battery power is negative while charging, the signed grid power is
+    negative while selling.
+    """
+    pv = snapshot.get(("statistics", "pcs_pv_total_power"))
+    battery = snapshot.get(("statistics", "batconv_power"))
+    grid = snapshot.get(("statistics", "grid_power"))
+    load = snapshot.get(("statistics", "load_power"))
+    if pv is None or battery is None or grid is None or load is None:
+        return {(DERIVED, metric): None for metric in METRICS}
+
+    if snapshot.get(("direction", "is_battery_charging_")):
+        charge, discharge = battery, 0
+    else:
+        charge, discharge = 0, battery
+    selling = snapshot.get(("direction", "is_grid_selling_"))
+
+    pv_to_load = min(pv, load)
+    pv_to_battery = min(pv - pv_to_load, charge)
+    battery_to_load = min(discharge, load - pv_to_load)
+    grid_to_load = max(load - pv_to_load - battery_to_load, 0)
+    flows = {
+        BATTERY_POWER: discharge - charge,
+        GRID_POWER: -grid if selling else grid,
+        PV_TO_LOAD: pv_to_load,
+        PV_TO_BATTERY: pv_to_battery,
+        PV_TO_GRID: max(pv - pv_to_load - pv_to_battery, 0),
+        BATTERY_TO_LOAD: battery_to_load,
+        BATTERY_TO_GRID: discharge - battery_to_load,
+        GRID_TO_LOAD: grid_to_load,
+        GRID_TO_BATTERY: max(charge - pv_to_battery, 0),
+        SELF_SUFFICIENCY: (
+            round(100 * (1 - grid_to_load / load), 1) if load > 0 else 100.0
+        ),
+    }
+    return {(DERIVED, metric): value for metric, value in flows.items()}
@@ -0,0 +1,88 @@
+"""Recent numeric readings of a coordinator kept in memory."""
+
+from array import array
+from collections.abc import Iterable, Mapping
+from math import isnan, nan
+from typing import Any
+
+from .const import EssKey
+
+
+def metric_name(key: EssKey) -> str:
+    """Return the name of a value in the history, e.g. statistics_grid_power."""
+    group, name = key
+    return name if group is None else f"{group}_{name}"
+
+
+class ReadingBuffer:
+    """Ring buffer of the numeric values of the last polls.
+
+    Every value has a column of doubles next to a shared timestamp column,
+    a row is written per poll. Values missing from a poll are NaN.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Allocate the timestamp column for capacity rows."""
+        self.capacity = capacity
+        self._timestamps = array("d", [0.0]) * capacity
+        self._columns: dict[EssKey, array[float]] = {}
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return self._size
+
+    def append(self, timestamp: float, snapshot: Mapping[EssKey, Any]) -> None:
+        """Write the numeric values of a snapshot as the newest row."""
+        row = self._next
+        for key, value in snapshot.items():
+            if key not in self._columns and _is_number(value):
+                self._columns[key] = array("d", [nan]) * self.capacity
+        self._timestamps[row] = timestamp
+        for key, column in self._columns.items():
+            value = snapshot.get(key)
+            column[row] = value if _is_number(value) else nan
+        self._next = (row + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def _rows(self) -> range:
+        """Return the rows from the oldest to the newest, modulo capacity."""
+        first = self._next - self._size
+        return range(first, first + self._size)
+
+    def query(
+        self, start: float, end: float, names: Iterable[str] | None = None
+    ) -> dict[str, Any]:
+        """Return the rows with a timestamp between start and end."""
+        rows = [
+            row % self.capacity
+            for row in self._rows()
+            if start <= self._timestamps[row % self.capacity] <= end
+        ]
+        wanted = None if names is None else set(names)
+        values = {}
+        for key, column in self._columns.items():
+            name = metric_name(key)
+            if wanted is not None and name not in wanted:
+                continue
+            values[name] = [None if isnan(v := column[row]) else v for row in rows]
+        return {
+            "timestamps": [self._timestamps[row] for row in rows],
+            "values": values,
+        }
+
+    def resized(self, capacity: int) -> "ReadingBuffer":
+        """Return a buffer of another capacity with the newest rows of this one."""
+        buffer = ReadingBuffer(capacity)
+        for row in self._rows()[-capacity:]:
+            row %= self.capacity
+            buffer.append(
+                self._timestamps[row],
+                {key: column[row] for key, column in self._columns.items()},
+            )
+        return buffer
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, int | float) and not isinstance(value, bool)
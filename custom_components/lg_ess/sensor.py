@@ -1,37 +1,65 @@
 """Example integration using DataUpdateCoordinator."""
 
-from datetime import date, datetime
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
 import logging
+import time
+from typing import Any
 
-from pyess.aio_ess import ESSAuthException
-
-from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.components.binary_sensor import (
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     PERCENTAGE,
+    EntityCategory,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
     UnitOfEnergy,
     UnitOfFrequency,
     UnitOfPower,
+    UnitOfTime,
 )
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .client import BreakerState, CircuitBreaker
 from .const import DOMAIN
 from .coordinator import (
-    CommonCoordinator,
+    INTERVAL_KEY,
+    POLLED_KEY,
     ESSCoordinator,
-    HomeCoordinator,
-    SystemInfoCoordinator,
+    EssData,
+    EssKey,
+    max_key,
+    min_key,
+)
+from .counters import LIFETIME
+from .flows import (
+    BATTERY_POWER,
+    BATTERY_TO_GRID,
+    BATTERY_TO_LOAD,
+    DERIVED,
+    GRID_POWER,
+    GRID_TO_BATTERY,
+    GRID_TO_LOAD,
+    PV_TO_BATTERY,
+    PV_TO_GRID,
+    PV_TO_LOAD,
+    SELF_SUFFICIENCY,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -56,34 +84,450 @@ _CO2 = "mdi:molecule-co2"
 _LOAD = "mdi:home-lightning-bolt"
 _HEATPUMP = "mdi:heat-pump"
 
+_COMMON = "common"
+_SYSTEM = "system"
+_HOME = "home"
+
+_HEATPUMP_FEATURE = "heatpump"
+_EV_FEATURE = "evcharger"
+_PV3_FEATURE = "pv3"
+_BMS2_FEATURE = "bms_unit2"
+
+# Power above which the third PV string counts as connected
+_STRING_WATT = 10
+
+type Snapshot = Mapping[EssKey, Any]
+
+
+@dataclass(frozen=True, kw_only=True)
+class EssSensorEntityDescription(SensorEntityDescription):
+    """Describes an LG ESS sensor."""
+
+    # Attribute of EssData holding the coordinator
+    coordinator: str
+    # Snapshot keys the value is computed from
+    data_keys: tuple[EssKey, ...]
+    value_fn: Callable[[Snapshot], Any]
+    # Unit of the deadband applied to the state writes, None writes every change
+    deadband_unit: str | None = None
+    # Replaced by the hourly external statistics if they are enabled
+    energy: bool = False
+    # Optional subsystem the sensor belongs to
+    feature: str | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class EssBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Describes an LG ESS binary sensor."""
+
+    coordinator: str
+    data_keys: tuple[EssKey, ...]
+    is_on_fn: Callable[[Snapshot], bool | None]
+    feature: str | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class EssFeature:
+    """Optional subsystem whose entities are added once it is present."""
+
+    coordinator: str
+    data_keys: tuple[EssKey, ...]
+    present_fn: Callable[[Snapshot], bool]
+    # Once added, keep the entities while present_fn is false, e.g. for a PV
+    # string at night
+    sticky: bool = False
+
+
+def _unique_id(serial_number: str, key: str) -> str:
+    return f"${serial_number}_${key}"
+
+
+def _entity_key(group: str | None, key: str) -> str:
+    entity = key if group is None else group + "_" + key
+    # Fix typos
+    return (
+        entity.replace("_enery", "_energy")
+        .replace("_enegy", "_energy")
+        .replace("_stauts", "_status")
+    )
+
+
+def _value_fn(
+    data_key: EssKey, modify: Callable[[Any], Any] | None = None
+) -> Callable[[Snapshot], Any]:
+    if modify is None:
+        return lambda snapshot: snapshot.get(data_key)
+
+    def _value(snapshot: Snapshot) -> Any:
+        if (value := snapshot.get(data_key)) is None:
+            return None
+        return modify(value)
+
+    return _value
+
+
+def _sensor(
+    coordinator: str,
+    group: str | None,
+    key: str,
+    modify: Callable[[Any], Any] | None = None,
+    **kwargs: Any,
+) -> EssSensorEntityDescription:
+    """Describe a sensor publishing a value of the payload."""
+    entity = _entity_key(group, key)
+    return EssSensorEntityDescription(
+        key=entity,
+        translation_key=entity,
+        coordinator=coordinator,
+        data_keys=((group, key),),
+        value_fn=_value_fn((group, key), modify),
+        **kwargs,
+    )
+
+
+def _measurement(
+    coordinator: str,
+    group: str | None,
+    key: str,
+    unit: str | None = None,
+    modify: Callable[[Any], Any] | None = None,
+    **kwargs: Any,
+) -> EssSensorEntityDescription:
+    """Describe a measurement sensor with the deadband of its unit."""
+    kwargs.setdefault("deadband_unit", unit)
+    return _sensor(
+        coordinator,
+        group,
+        key,
+        modify,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=unit,
+        **kwargs,
+    )
+
+
+def _increasing(
+    coordinator: str, group: str | None, key: str, **kwargs: Any
+) -> EssSensorEntityDescription:
+    """Describe an increasing total sensor."""
+    return _sensor(
+        coordinator,
+        group,
+        key,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+        **kwargs,
+    )
+
+
+def _energy(group: str, key: str, **kwargs: Any) -> EssSensorEntityDescription:
+    """Describe an increasing energy Wh sensor of the common payload."""
+    return _increasing(
+        _COMMON,
+        group,
+        key,
+        suggested_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        energy=True,
+        **kwargs,
+    )
+
+
+def _directional(key: str, metric: str) -> EssSensorEntityDescription:
+    """Describe a power sensor that is negative in one direction."""
+    data_key = (DERIVED, metric)
+    return EssSensorEntityDescription(
+        key=key,
+        translation_key=key,
+        state_class=SensorStateClass.MEASUREMENT,
+        coordinator=_HOME,
+        data_keys=(data_key,),
+        value_fn=_value_fn(data_key),
+        deadband_unit=UnitOfPower.WATT,
+    )
+
+
+def _flow(metric: str, **kwargs: Any) -> EssSensorEntityDescription:
+    """Describe a power flow derived from the home data."""
+    return _measurement(
+        _HOME,
+        DERIVED,
+        metric,
+        UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        **kwargs,
+    )
+
+
+def _extremes(
+    group: str, key: str, **kwargs: Any
+) -> tuple[EssSensorEntityDescription, ...]:
+    """Describe the minimum and maximum of a power over the aggregation window."""
+    return tuple(
+        _measurement(
+            _HOME,
+            group,
+            published[1],
+            UnitOfPower.WATT,
+            device_class=SensorDeviceClass.POWER,
+            entity_registry_enabled_default=False,
+            **kwargs,
+        )
+        for published in (min_key((group, key)), max_key((group, key)))
+    )
+
+
+def _binary(
+    coordinator: str, group: str | None, key: str, **kwargs: Any
+) -> EssBinarySensorEntityDescription:
+    """Describe a binary sensor of a decoded boolean."""
+    entity = key if group is None else group + "_" + key
+    data_key = (group, key)
+    return EssBinarySensorEntityDescription(
+        key=entity,
+        translation_key=entity,
+        coordinator=coordinator,
+        data_keys=(data_key,),
+        is_on_fn=lambda snapshot: snapshot.get(data_key),
+        **kwargs,
+    )
+
+
+SENSORS: tuple[EssSensorEntityDescription, ...] = (
+    _measurement(_COMMON, "BATT", "dc_power", UnitOfPower.WATT, icon=_BATTERYLOAD),
+    _measurement(_COMMON, "LOAD", "load_power", UnitOfPower.WATT, icon=_LOAD),
+    _measurement(_COMMON, "PCS", "today_self_consumption", PERCENTAGE),
+    _sensor(_SYSTEM, "pms", "model"),
+    _sensor(_SYSTEM, "pms", "serialno"),
+    _sensor(_SYSTEM, "pms", "ac_input_power"),
+    _sensor(_SYSTEM, "pms", "ac_output_power"),
+    _sensor(_SYSTEM, "pms", "install_date"),
+    _measurement(
+        _SYSTEM, "batt", "capacity", UnitOfEnergy.WATT_HOUR, lambda x: x * 100
+    ),
+    _sensor(_SYSTEM, "batt", "type"),
+    _measurement(_SYSTEM, "batt", "hbc_cycle_count_1"),
+    _measurement(_SYSTEM, "batt", "hbc_cycle_count_2"),
+    _sensor(_SYSTEM, "batt", "install_date"),
+    _sensor(_SYSTEM, "version", "pms_version"),
+    _sensor(_SYSTEM, "version", "pms_build_date"),
+    _sensor(_SYSTEM, "version", "pcs_version"),
+    _sensor(_SYSTEM, "version", "bms_version"),
+    _sensor(_SYSTEM, "version", "bms_unit1_version"),
+    _sensor(_SYSTEM, "version", "bms_unit2_version", feature=_BMS2_FEATURE),
+    _measurement(
+        _HOME,
+        "statistics",
+        "pcs_pv_total_power",
+        icon=_PV,
+        deadband_unit=UnitOfPower.WATT,
+    ),
+    _measurement(
+        _HOME,
+        "statistics",
+        "batconv_power",
+        icon=_BATTERYLOAD,
+        deadband_unit=UnitOfPower.WATT,
+    ),
+    # 1: CHARGING, 2: DISCHARGING
+    _measurement(_HOME, "statistics", "bat_status", icon=_BATTERYSTATUS),
+    _measurement(_HOME, "statistics", "bat_user_soc", PERCENTAGE, icon=_BATTERYHALF),
+    _measurement(_HOME, "statistics", "load_power", UnitOfPower.WATT),
+    _measurement(
+        _HOME, "statistics", "ac_output_power", deadband_unit=UnitOfPower.WATT
+    ),
+    _measurement(_HOME, "statistics", "load_today", icon=_LOAD),
+    _measurement(_HOME, "statistics", "grid_power", UnitOfPower.WATT, icon=_GRID),
+    _measurement(
+        _HOME, "statistics", "current_day_self_consumption", PERCENTAGE, icon=_PV
+    ),
+    _sensor(_HOME, "operation", "status"),
+    _measurement(_HOME, "operation", "mode"),
+    _measurement(_HOME, "operation", "drm_mode0"),
+    _measurement(_HOME, "operation", "remote_mode"),
+    _measurement(_HOME, "operation", "drm_control"),
+    _sensor(_HOME, "pcs_fault", "pcs_status"),
+    _sensor(_HOME, "pcs_fault", "pcs_op_status"),
+    _measurement(
+        _HOME,
+        "heatpump",
+        "heatpump_protocol",
+        icon=_HEATPUMP,
+        feature=_HEATPUMP_FEATURE,
+    ),
+    _measurement(
+        _HOME, "heatpump", "current_temp", icon=_HEATPUMP, feature=_HEATPUMP_FEATURE
+    ),
+    _measurement(
+        _HOME,
+        "evcharger",
+        "ev_power",
+        UnitOfPower.WATT,
+        icon=_EV,
+        feature=_EV_FEATURE,
+    ),
+    _measurement(_HOME, None, "gridWaitingTime"),
+    _sensor(_HOME, None, "backupmode", icon=_BACKUP),
+    _energy("BATT", "today_batt_discharge_enery", icon=_DISCHARGING),
+    _energy("BATT", "today_batt_charge_energy", icon=_CHARGING),
+    _energy("BATT", "month_batt_discharge_energy", icon=_DISCHARGING),
+    _energy("BATT", "month_batt_charge_energy", icon=_CHARGING),
+    _energy("LOAD", "today_load_consumption_sum", icon=_LOAD),
+    _energy("LOAD", "today_pv_direct_consumption_enegy", icon=_PV),
+    _energy("LOAD", "today_grid_power_purchase_energy", icon=_FROMGRID),
+    _energy("LOAD", "month_load_consumption_sum", icon=_LOAD),
+    _energy("LOAD", "month_pv_direct_consumption_energy", icon=_PV),
+    _energy("LOAD", "month_grid_power_purchase_energy", icon=_FROMGRID),
+    _energy("PCS", "today_pv_generation_sum", icon=_PV),
+    _energy("PCS", "today_grid_feed_in_energy", icon=_TOGRID),
+    _energy("PCS", "month_pv_generation_sum", icon=_PV),
+    _energy("PCS", "month_grid_feed_in_energy", icon=_TOGRID),
+    _energy(LIFETIME, "batt_charge_energy", icon=_CHARGING),
+    _energy(LIFETIME, "batt_discharge_energy", icon=_DISCHARGING),
+    _energy(LIFETIME, "load_consumption_sum", icon=_LOAD),
+    _energy(LIFETIME, "pv_direct_consumption_energy", icon=_PV),
+    _energy(LIFETIME, "grid_power_purchase_energy", icon=_FROMGRID),
+    _energy(LIFETIME, "pv_generation_sum", icon=_PV),
+    _energy(LIFETIME, "grid_feed_in_energy", icon=_TOGRID),
+    _measurement(_COMMON, "PV", "pv1_voltage", UnitOfElectricPotential.VOLT, icon=_ONE),
+    _measurement(_COMMON, "PV", "pv2_voltage", UnitOfElectricPotential.VOLT, icon=_TWO),
+    _measurement(
+        _COMMON,
+        "PV",
+        "pv3_voltage",
+        UnitOfElectricPotential.VOLT,
+        icon=_THREE,
+        feature=_PV3_FEATURE,
+    ),
+    _measurement(_COMMON, "PV", "pv1_power", UnitOfPower.WATT, icon=_ONE),
+    _measurement(_COMMON, "PV", "pv2_power", UnitOfPower.WATT, icon=_TWO),
+    _measurement(
+        _COMMON,
+        "PV",
+        "pv3_power",
+        UnitOfPower.WATT,
+        icon=_THREE,
+        feature=_PV3_FEATURE,
+    ),
+    _measurement(_COMMON, "PV", "pv1_current", UnitOfElectricCurrent.AMPERE, icon=_ONE),
+    _measurement(_COMMON, "PV", "pv2_current", UnitOfElectricCurrent.AMPERE, icon=_TWO),
+    _measurement(
+        _COMMON,
+        "PV",
+        "pv3_current",
+        UnitOfElectricCurrent.AMPERE,
+        icon=_THREE,
+        feature=_PV3_FEATURE,
+    ),
+    _increasing(_COMMON, "PCS", "month_co2_reduction_accum", icon=_CO2),
+    _sensor(_COMMON, "PV", "capacity", icon=_PV),  # Wp
+    _sensor(_COMMON, "BATT", "status", icon=_BATTERYSTATUS),
+    _measurement(_COMMON, "BATT", "safety_soc", PERCENTAGE, icon=_WINTER),
+    _measurement(_COMMON, "BATT", "backup_soc", PERCENTAGE, icon=_BACKUP),
+    _measurement(_COMMON, "GRID", "active_power", UnitOfPower.WATT, icon=_FROMGRID),
+    _measurement(_COMMON, "GRID", "a_phase", UnitOfElectricPotential.VOLT, icon=_GRID),
+    _measurement(_COMMON, "GRID", "freq", UnitOfFrequency.HERTZ, icon=_GRID),
+    _sensor(_COMMON, "PCS", "pcs_stauts"),
+    _measurement(_COMMON, "PCS", "feed_in_limitation", PERCENTAGE, icon=_TOGRID),
+    _sensor(_COMMON, "PCS", "operation_mode"),
+    _directional("batt_directional", BATTERY_POWER),
+    _directional("grid_directional", GRID_POWER),
+    _flow(PV_TO_LOAD, icon=_PV),
+    _flow(PV_TO_BATTERY, icon=_CHARGING),
+    _flow(PV_TO_GRID, icon=_TOGRID),
+    _flow(BATTERY_TO_LOAD, icon=_DISCHARGING),
+    _flow(BATTERY_TO_GRID, icon=_DISCHARGING),
+    _flow(GRID_TO_LOAD, icon=_FROMGRID),
+    _flow(GRID_TO_BATTERY, icon=_CHARGING),
+    _measurement(_HOME, DERIVED, SELF_SUFFICIENCY, PERCENTAGE, icon=_LOAD),
+    *_extremes("statistics", "pcs_pv_total_power", icon=_PV),
+    *_extremes("statistics", "load_power", icon=_LOAD),
+    *_extremes(DERIVED, BATTERY_POWER, icon=_BATTERYLOAD),
+    *_extremes(DERIVED, GRID_POWER, icon=_GRID),
+)
+
+BINARY_SENSORS: tuple[EssBinarySensorEntityDescription, ...] = (
+    _binary(_HOME, "statistics", "bat_use", icon=_BATTERYHOME),
+    _binary(_HOME, "direction", "is_direct_consuming_", icon=_PV),
+    _binary(_HOME, "direction", "is_battery_charging_", icon=_CHARGING),
+    _binary(_HOME, "direction", "is_battery_discharging_", icon=_DISCHARGING),
+    _binary(_HOME, "direction", "is_grid_selling_", icon=_TOGRID),
+    _binary(_HOME, "direction", "is_grid_buying_", icon=_FROMGRID),
+    _binary(_HOME, "direction", "is_charging_from_grid_", icon=_CHARGING),
+    _binary(_HOME, "direction", "is_discharging_to_grid_", icon=_DISCHARGING),
+    _binary(_HOME, "operation", "pcs_standbymode"),
+    _binary(_HOME, "wintermode", "winter_status", icon=_WINTER),
+    _binary(_HOME, "wintermode", "backup_status", icon=_BACKUP),
+    _binary(
+        _HOME,
+        "heatpump",
+        "heatpump_activate",
+        icon=_HEATPUMP,
+        feature=_HEATPUMP_FEATURE,
+    ),
+    _binary(
+        _HOME,
+        "heatpump",
+        "heatpump_working",
+        icon=_HEATPUMP,
+        feature=_HEATPUMP_FEATURE,
+    ),
+    _binary(_HOME, "evcharger", "ev_activate", icon=_EV, feature=_EV_FEATURE),
+    _binary(_COMMON, "BATT", "winter_setting", icon=_WINTER),
+    _binary(_COMMON, "BATT", "winter_status", icon=_WINTER),
+    _binary(_COMMON, "BATT", "backup_setting", icon=_BACKUP),
+    _binary(_COMMON, "BATT", "backup_status", icon=_BACKUP),
+)
+
+
+FEATURES: dict[str, EssFeature] = {
+    _HEATPUMP_FEATURE: EssFeature(
+        coordinator=_HOME,
+        data_keys=(("heatpump", "heatpump_activate"),),
+        present_fn=lambda snapshot: bool(
+            snapshot.get(("heatpump", "heatpump_activate"))
+        ),
+    ),
+    _EV_FEATURE: EssFeature(
+        coordinator=_HOME,
+        data_keys=(("evcharger", "ev_activate"),),
+        present_fn=lambda snapshot: bool(snapshot.get(("evcharger", "ev_activate"))),
+    ),
+    _PV3_FEATURE: EssFeature(
+        coordinator=_COMMON,
+        data_keys=(("PV", "pv3_power"),),
+        present_fn=lambda snapshot: (
+            (snapshot.get(("PV", "pv3_power")) or 0) > _STRING_WATT
+        ),
+        sticky=True,
+    ),
+    _BMS2_FEATURE: EssFeature(
+        coordinator=_SYSTEM,
+        data_keys=(("version", "bms_unit2_version"),),
+        present_fn=lambda snapshot: bool(
+            str(snapshot.get(("version", "bms_unit2_version")) or "").strip()
+        ),
+    ),
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Set up sensors from config entry."""
-    ess = hass.data[DOMAIN][config_entry.entry_id]
-    common_coordinator = CommonCoordinator(hass, ess)
-    system_coordinator = SystemInfoCoordinator(hass, ess)
-    home_coordinator = HomeCoordinator(hass, ess)
-
-    # Fetch initial data so we have data when entities subscribe
-    #
-    # If the refresh fails, async_config_entry_first_refresh will
-    # raise ConfigEntryNotReady and setup will try again later
-    #
-    # If you do not want to retry setup on failure, use
-    # coordinator.async_refresh() instead
-    #
-    try:
-        await common_coordinator.async_config_entry_first_refresh()
-        await system_coordinator.async_config_entry_first_refresh()
-        await home_coordinator.async_config_entry_first_refresh()
-    except ESSAuthException as e:
-        # Raising ConfigEntryAuthFailed will cancel future updates
-        # and start a config flow with SOURCE_REAUTH (async_step_reauth)
-        raise ConfigEntryAuthFailed from e
+    """Set up sensors from config entry.
+
+    The entities of an optional subsystem are only added once it shows up in
+    the data. Those added before are disabled while it is absent, unless the
+    subsystem is sticky.
+    """
+    data: EssData = hass.data[DOMAIN][config_entry.entry_id]
+    coordinators: dict[str, ESSCoordinator] = {
+        _COMMON: data.common,
+        _SYSTEM: data.system,
+        _HOME: data.home,
+    }
 
     device_info = DeviceInfo(
         configuration_url=None,
@@ -92,705 +536,331 @@ async def async_setup_entry(
         hw_version=None,
         identifiers={(DOMAIN, config_entry.entry_id)},
         manufacturer="LG",
-        model=system_coordinator.data["pms"]["model"],
+        model=data.system.data["pms"]["model"],
         name=config_entry.title,
-        serial_number=system_coordinator.data["pms"]["serialno"],
+        serial_number=data.system.data["pms"]["serialno"],
         suggested_area=None,
-        sw_version=system_coordinator.data["version"]["pcs_version"],
+        sw_version=data.system.data["version"]["pcs_version"],
         via_device=(DOMAIN, ""),
     )
 
-    async_add_entities(
-        [
-            MeasurementSensor(
-                common_coordinator,
-                device_info,
-                "BATT",
-                "dc_power",
-                UnitOfPower.WATT,
-                icon=_BATTERYLOAD,
-            ),
-            MeasurementSensor(
-                common_coordinator,
-                device_info,
-                "LOAD",
-                "load_power",
-                UnitOfPower.WATT,
-                icon=_LOAD,
-            ),
-            MeasurementSensor(
-                common_coordinator,
-                device_info,
-                "PCS",
-                "today_self_consumption",
-                PERCENTAGE,
-            ),
-            EssSensor(system_coordinator, device_info, "pms", "model"),
-            EssSensor(system_coordinator, device_info, "pms", "serialno"),
-            EssSensor(
-                system_coordinator, device_info, "pms", "ac_input_power"
-            ),  # number
-            EssSensor(
-                system_coordinator, device_info, "pms", "ac_output_power"
-            ),  # number
-            EssSensor(
-                system_coordinator, device_info, "pms", "install_date", _parse_date
-            ),
-            MeasurementSensor(
-                system_coordinator,
-                device_info,
-                "batt",
-                "capacity",
-                UnitOfEnergy.WATT_HOUR,
-                lambda x: int(x) * 100,
-            ),
-            EssSensor(system_coordinator, device_info, "batt", "type"),  #
-            MeasurementSensor(
-                system_coordinator, device_info, "batt", "hbc_cycle_count_1"
-            ),  # number
-            MeasurementSensor(
-                system_coordinator, device_info, "batt", "hbc_cycle_count_2"
-            ),  # number
-            EssSensor(
-                system_coordinator, device_info, "batt", "install_date", _parse_date
-            ),
-            EssSensor(system_coordinator, device_info, "version", "pms_version"),
-            EssSensor(system_coordinator, device_info, "version", "pms_build_date"),
-            EssSensor(system_coordinator, device_info, "version", "pcs_version"),
-            EssSensor(system_coordinator, device_info, "version", "bms_version"),
-            EssSensor(system_coordinator, device_info, "version", "bms_unit1_version"),
-            EssSensor(system_coordinator, device_info, "version", "bms_unit2_version"),
-            MeasurementSensor(
-                home_coordinator,
-                device_info,
-                "statistics",
-                "pcs_pv_total_power",
-                icon=_PV,
-            ),
-            MeasurementSensor(
-                home_coordinator,
-                device_info,
-                "statistics",
-                "batconv_power",
-                icon=_BATTERYLOAD,
-            ),
-            BinarySensor(
-                home_coordinator,
-                device_info,
-                "statistics",
-                "bat_use",
-                icon=_BATTERYHOME,
-            ),
-            # 1: CHARGING, 2: DISCHARGING
-            MeasurementSensor(
-                home_coordinator,
-                device_info,
-                "statistics",
-                "bat_status",
-                icon=_BATTERYSTATUS,
-            ),  # unknown enum
-            MeasurementSensor(
-                home_coordinator,
-                device_info,
-                "statistics",
-                "bat_user_soc",
-                PERCENTAGE,
-                icon=_BATTERYHALF,
-            ),
-            MeasurementSensor(
-                home_coordinator,
-                device_info,
-                "statistics",
-                "load_power",
-                UnitOfPower.WATT,
-            ),
-            MeasurementSensor(
-                home_coordinator, device_info, "statistics", "ac_output_power"
-            ),
-            MeasurementSensor(
-                home_coordinator, device_info, "statistics", "load_today", icon=_LOAD
-            ),
-            MeasurementSensor(
-                home_coordinator,
-                device_info,
-                "statistics",
-                "grid_power",
-                UnitOfPower.WATT,
-                icon=_GRID,
-            ),
-            MeasurementSensor(
-                home_coordinator,
-                device_info,
-                "statistics",
-                "current_day_self_consumption",
-                PERCENTAGE,
-                icon=_PV,
-            ),
-            BinarySensor(
-                home_coordinator,
-                device_info,
-                "direction",
-                "is_direct_consuming_",
-                icon=_PV,
-            ),
-            BinarySensor(
-                home_coordinator,
-                device_info,
-                "direction",
-                "is_battery_charging_",
-                icon=_CHARGING,
-            ),
-            BinarySensor(
-                home_coordinator,
-                device_info,
-                "direction",
-                "is_battery_discharging_",
-                icon=_DISCHARGING,
-            ),
-            BinarySensor(
-                home_coordinator,
-                device_info,
-                "direction",
-                "is_grid_selling_",
-                icon=_TOGRID,
-            ),
-            BinarySensor(
-                home_coordinator,
-                device_info,
-                "direction",
-                "is_grid_buying_",
-                icon=_FROMGRID,
-            ),
-            BinarySensor(
-                home_coordinator,
-                device_info,
-                "direction",
-                "is_charging_from_grid_",
-                icon=_CHARGING,
-            ),
-            BinarySensor(
-                home_coordinator,
-                device_info,
-                "direction",
-                "is_discharging_to_grid_",
-                icon=_DISCHARGING,
-            ),
-            EssSensor(home_coordinator, device_info, "operation", "status"),
-            MeasurementSensor(home_coordinator, device_info, "operation", "mode"),
-            BinarySensor(home_coordinator, device_info, "operation", "pcs_standbymode"),
-            MeasurementSensor(home_coordinator, device_info, "operation", "drm_mode0"),
-            MeasurementSensor(
-                home_coordinator, device_info, "operation", "remote_mode"
-            ),
-            MeasurementSensor(
-                home_coordinator, device_info, "operation", "drm_control"
-            ),
-            BinarySensor(
-                home_coordinator,
-                device_info,
-                "wintermode",
-                "winter_status",
-                icon=_WINTER,
-            ),
-            BinarySensor(
-                home_coordinator,
-                device_info,
-                "wintermode",
-                "backup_status",
-                icon=_BACKUP,
-            ),
-            EssSensor(home_coordinator, device_info, "pcs_fault", "pcs_status"),
-            EssSensor(home_coordinator, device_info, "pcs_fault", "pcs_op_status"),
-            MeasurementSensor(
-                home_coordinator,
-                device_info,
-                "heatpump",
-                "heatpump_protocol",
-                icon=_HEATPUMP,
-            ),
-            BinarySensor(
-                home_coordinator,
-                device_info,
-                "heatpump",
-                "heatpump_activate",
-                icon=_HEATPUMP,
-            ),
-            MeasurementSensor(
-                home_coordinator,
-                device_info,
-                "heatpump",
-                "current_temp",
-                icon=_HEATPUMP,
-            ),
-            BinarySensor(
-                home_coordinator,
-                device_info,
-                "heatpump",
-                "heatpump_working",
-                icon=_HEATPUMP,
-            ),
-            BinarySensor(
-                home_coordinator, device_info, "evcharger", "ev_activate", icon=_EV
-            ),
-            MeasurementSensor(
-                home_coordinator,
-                device_info,
-                "evcharger",
-                "ev_power",
-                UnitOfPower.WATT,
-                icon=_EV,
-            ),
-            MeasurementSensor(home_coordinator, device_info, None, "gridWaitingTime"),
-            EssSensor(home_coordinator, device_info, None, "backupmode", icon=_BACKUP),
-            IncreasingEnergySensor(
-                common_coordinator,
-                device_info,
-                "BATT",
-                "today_batt_discharge_enery",
-                icon=_DISCHARGING,
-            ),
-            IncreasingEnergySensor(
-                common_coordinator,
-                device_info,
-                "BATT",
-                "today_batt_charge_energy",
-                icon=_CHARGING,
-            ),
-            IncreasingEnergySensor(
-                common_coordinator,
-                device_info,
-                "BATT",
-                "month_batt_discharge_energy",
-                icon=_DISCHARGING,
-            ),
-            IncreasingEnergySensor(
-                common_coordinator,
-                device_info,
-                "BATT",
-                "month_batt_charge_energy",
-                icon=_CHARGING,
-            ),
-            IncreasingEnergySensor(
-                common_coordinator,
-                device_info,
-                "LOAD",
-                "today_load_consumption_sum",
-                icon=_LOAD,
-            ),
-            IncreasingEnergySensor(
-                common_coordinator,
-                device_info,
-                "LOAD",
-                "today_pv_direct_consumption_enegy",
-                icon=_PV,
-            ),
-            IncreasingEnergySensor(
-                common_coordinator,
-                device_info,
-                "LOAD",
-                "today_grid_power_purchase_energy",
-                icon=_FROMGRID,
-            ),
-            IncreasingEnergySensor(
-                common_coordinator,
-                device_info,
-                "LOAD",
-                "month_load_consumption_sum",
-                icon=_LOAD,
-            ),
-            IncreasingEnergySensor(
-                common_coordinator,
-                device_info,
-                "LOAD",
-                "month_pv_direct_consumption_energy",
-                icon=_PV,
-            ),
-            IncreasingEnergySensor(
-                common_coordinator,
-                device_info,
-                "LOAD",
-                "month_grid_power_purchase_energy",
-                icon=_FROMGRID,
-            ),
-            IncreasingEnergySensor(
-                common_coordinator,
-                device_info,
-                "PCS",
-                "today_pv_generation_sum",
-                icon=_PV,
-            ),
-            IncreasingEnergySensor(
-                common_coordinator,
-                device_info,
-                "PCS",
-                "today_grid_feed_in_energy",
-                icon=_TOGRID,
-            ),
-            IncreasingEnergySensor(
-                common_coordinator,
-                device_info,
-                "PCS",
-                "month_pv_generation_sum",
-                icon=_PV,
-            ),
-            IncreasingEnergySensor(
-                common_coordinator,
-                device_info,
-                "PCS",
-                "month_grid_feed_in_energy",
-                icon=_TOGRID,
-            ),
-            MeasurementSensor(
-                common_coordinator,
-                device_info,
-                "PV",
-                "pv1_voltage",
-                UnitOfElectricPotential.VOLT,
-                icon=_ONE,
-            ),
-            MeasurementSensor(
-                common_coordinator,
-                device_info,
-                "PV",
-                "pv2_voltage",
-                UnitOfElectricPotential.VOLT,
-                icon=_TWO,
-            ),
-            MeasurementSensor(
-                common_coordinator,
-                device_info,
-                "PV",
-                "pv3_voltage",
-                UnitOfElectricPotential.VOLT,
-                icon=_THREE,
-            ),
-            MeasurementSensor(
-                common_coordinator,
-                device_info,
-                "PV",
-                "pv1_power",
-                UnitOfPower.WATT,
-                icon=_ONE,
-            ),
-            MeasurementSensor(
-                common_coordinator,
-                device_info,
-                "PV",
-                "pv2_power",
-                UnitOfPower.WATT,
-                icon=_TWO,
-            ),
-            MeasurementSensor(
-                common_coordinator,
-                device_info,
-                "PV",
-                "pv3_power",
-                UnitOfPower.WATT,
-                icon=_THREE,
-            ),
-            MeasurementSensor(
-                common_coordinator,
-                device_info,
-                "PV",
-                "pv1_current",
-                UnitOfElectricCurrent.AMPERE,
-                icon=_ONE,
-            ),
-            MeasurementSensor(
-                common_coordinator,
-                device_info,
-                "PV",
-                "pv2_current",
-                UnitOfElectricCurrent.AMPERE,
-                icon=_TWO,
-            ),
-            MeasurementSensor(
-                common_coordinator,
-                device_info,
-                "PV",
-                "pv3_current",
-                UnitOfElectricCurrent.AMPERE,
-                icon=_THREE,
-            ),
-            IncreasingSensor(
-                common_coordinator,
-                device_info,
-                "PCS",
-                "month_co2_reduction_accum",
-                icon=_CO2,
-            ),
-            EssSensor(
-                common_coordinator, device_info, "PV", "capacity", icon=_PV
-            ),  # Wp
-            EssSensor(
-                common_coordinator, device_info, "BATT", "status", icon=_BATTERYSTATUS
-            ),
-            BinarySensor(
-                common_coordinator, device_info, "BATT", "winter_setting", icon=_WINTER
-            ),
-            BinarySensor(
-                common_coordinator, device_info, "BATT", "winter_status", icon=_WINTER
-            ),
-            MeasurementSensor(
-                common_coordinator,
-                device_info,
-                "BATT",
-                "safety_soc",
-                PERCENTAGE,
-                icon=_WINTER,
-            ),
-            BinarySensor(
-                common_coordinator, device_info, "BATT", "backup_setting", icon=_BACKUP
-            ),
-            BinarySensor(
-                common_coordinator, device_info, "BATT", "backup_status", icon=_BACKUP
-            ),
-            MeasurementSensor(
-                common_coordinator,
-                device_info,
-                "BATT",
-                "backup_soc",
-                PERCENTAGE,
-                icon=_BACKUP,
-            ),
-            MeasurementSensor(
-                common_coordinator,
-                device_info,
-                "GRID",
-                "active_power",
-                UnitOfPower.WATT,
-                icon=_FROMGRID,
-            ),
-            MeasurementSensor(
-                common_coordinator,
-                device_info,
-                "GRID",
-                "a_phase",
-                UnitOfElectricPotential.VOLT,
-                icon=_GRID,
-            ),
-            MeasurementSensor(
-                common_coordinator,
-                device_info,
-                "GRID",
-                "freq",
-                UnitOfFrequency.HERTZ,
-                icon=_GRID,
-            ),
-            EssSensor(common_coordinator, device_info, "PCS", "pcs_stauts"),
-            MeasurementSensor(
-                common_coordinator,
-                device_info,
-                "PCS",
-                "feed_in_limitation",
-                PERCENTAGE,
-                icon=_TOGRID,
-            ),
-            EssSensor(common_coordinator, device_info, "PCS", "operation_mode"),
-            DirectionalPowerSensor(
-                home_coordinator,
-                device_info,
-                "batt_directional",
-                "is_battery_charging_",
-                "batconv_power",
-            ),
-            DirectionalPowerSensor(
-                home_coordinator,
-                device_info,
-                "grid_directional",
-                "is_grid_selling_",
-                "grid_power",
-            ),
+    descriptions = [
+        description
+        for description in (*SENSORS, *BINARY_SENSORS)
+        if not (
+            isinstance(description, EssSensorEntityDescription)
+            and data.external_statistics
+            and description.energy
+        )
+    ]
+
+    def _entities(feature: str | None) -> list[SensorEntity | BinarySensorEntity]:
+        return [
+            (
+                BinarySensor(
+                    coordinators[description.coordinator], device_info, description
+                )
+                if isinstance(description, EssBinarySensorEntityDescription)
+                else EssSensor(
+                    coordinators[description.coordinator], device_info, description
+                )
+            )
+            for description in descriptions
+            if description.feature == feature
         ]
+
+    def _unique_ids(feature: str) -> set[str]:
+        return {
+            _unique_id(device_info["serial_number"], description.key)
+            for description in descriptions
+            if description.feature == feature
+        }
+
+    def _registered(feature: str) -> bool:
+        """Return if entities of the feature were added before."""
+        unique_ids = _unique_ids(feature)
+        return any(
+            entry.unique_id in unique_ids
+            and entry.disabled_by is not er.RegistryEntryDisabler.INTEGRATION
+            for entry in er.async_entries_for_config_entry(
+                er.async_get(hass), config_entry.entry_id
+            )
+        )
+
+    @callback
+    def _async_add(name: str) -> None:
+        _LOGGER.info("Adding the %s entities", name)
+        _async_set_disabled(hass, config_entry, _unique_ids(name), False)
+        async_add_entities(_entities(name))
+
+    entities = _entities(None)
+    for name, feature in FEATURES.items():
+        coordinator = coordinators[feature.coordinator]
+        if feature.present_fn(coordinator.snapshot) or (
+            feature.sticky and _registered(name)
+        ):
+            _async_set_disabled(hass, config_entry, _unique_ids(name), False)
+            entities.extend(_entities(name))
+        else:
+            _async_set_disabled(hass, config_entry, _unique_ids(name), True)
+            config_entry.async_on_unload(
+                _async_add_when_present(coordinator, feature, partial(_async_add, name))
+            )
+
+    entities.extend(
+        (
+            PollingIntervalSensor(data.home, device_info, "home_polling_interval"),
+            PollingIntervalSensor(data.common, device_info, "common_polling_interval"),
+            LastPollSensor(data.home, device_info, "home_last_poll"),
+            LastPollSensor(data.common, device_info, "common_last_poll"),
+            CircuitBreakerSensor(data.ess.breaker, device_info, "circuit_breaker"),
+        )
     )
+    async_add_entities(entities)
+
+
+@callback
+def _async_set_disabled(
+    hass: HomeAssistant, config_entry: ConfigEntry, unique_ids: set[str], disable: bool
+) -> None:
+    """Disable the registry entries of an absent feature, or enable them again.
+
+    Entries disabled by the user are left alone. Home Assistant reloads the
+    config entry shortly after an entry was enabled.
+    """
+    registry = er.async_get(hass)
+    for entry in er.async_entries_for_config_entry(registry, config_entry.entry_id):
+        if entry.unique_id not in unique_ids:
+            continue
+        if disable and entry.disabled_by is None:
+            registry.async_update_entity(
+                entry.entity_id, disabled_by=er.RegistryEntryDisabler.INTEGRATION
+            )
+        elif not disable and entry.disabled_by is er.RegistryEntryDisabler.INTEGRATION:
+            registry.async_update_entity(entry.entity_id, disabled_by=None)
+
+
+@callback
+def _async_add_when_present(
+    coordinator: ESSCoordinator,
+    feature: EssFeature,
+    add_entities: Callable[[], None],
+) -> CALLBACK_TYPE:
+    """Add the entities of a feature once it is present in the snapshot."""
+    unsubscribe: CALLBACK_TYPE | None = None
+
+    @callback
+    def _async_check() -> None:
+        nonlocal unsubscribe
+        if unsubscribe is None or not feature.present_fn(coordinator.snapshot):
+            return
+        unsubscribe()
+        unsubscribe = None
+        add_entities()
+
+    unsubscribe = coordinator.async_add_listener(_async_check, feature.data_keys)
+
+    @callback
+    def _async_unsubscribe() -> None:
+        if unsubscribe is not None:
+            unsubscribe()
+
+    return _async_unsubscribe
 
 
 class EssSensor(CoordinatorEntity[ESSCoordinator], SensorEntity):
-    """Basic sensor with common functionality."""
+    """Sensor computing its value from the snapshot of the coordinator."""
 
-    _group: str | None
-    _key: str
+    entity_description: EssSensorEntityDescription
 
     def __init__(
         self,
-        coordinator,
+        coordinator: ESSCoordinator,
         device_info: DeviceInfo,
-        group: str | None,
-        key: str,
-        modify=None,
-        icon: str | None = None,
+        description: EssSensorEntityDescription,
     ) -> None:
-        """Initialize the sensor with the common coordinator."""
-        super().__init__(coordinator)
+        """Initialize the sensor with the coordinator."""
+        super().__init__(coordinator, context=description.data_keys)
+        self.entity_description = description
         self._attr_device_info = device_info
-        self._group = group
-        self._key = key
-        self._modify = modify
-        if group is None:
-            entity = key
-        else:
-            entity = group + "_" + key
-        # Fix typos
-        entity = (
-            entity.replace("_enery", "_energy")
-            .replace("_enegy", "_energy")
-            .replace("_stauts", "_status")
-        )
-        self._attr_translation_key = entity
-        self._attr_unique_id = f"${device_info["serial_number"]}_${entity}"
-        self._attr_icon = icon
-        self.entity_id = f"sensor.${DOMAIN}_${entity}"
+        self._attr_unique_id = _unique_id(device_info["serial_number"], description.key)
+        self.entity_id = f"sensor.${DOMAIN}_${description.key}"
+        self._written_at = 0.0
+        self._written_available: bool | None = None
+        self._cancel_max_age: CALLBACK_TYPE | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Take the current value, later updates only arrive on changes."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._async_cancel_max_age)
+        self._handle_coordinator_update()
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        if self._group is None:
-            _LOGGER.debug("%s : %s", self._key, self.coordinator.data.get(self._key))
-            new_value = self.coordinator.data.get(self._key)
-        else:
-            _LOGGER.debug(
-                "%s-%s : %s",
-                self._key,
-                self._group,
-                self.coordinator.data[self._group].get(self._key),
-            )
-            new_value = self.coordinator.data[self._group].get(self._key)
-        if self._modify is not None:
-            new_value = self._modify(new_value)
-        self._attr_native_value = new_value
+        value = self.entity_description.value_fn(self.coordinator.snapshot)
+        now = time.monotonic()
+        if self._within_deadband(value, now):
+            if self._cancel_max_age is None:
+                # No update may follow if the value stays, write it once the
+                # last write is older than the maximum age
+                self._cancel_max_age = async_call_later(
+                    self.hass,
+                    self._written_at + self.coordinator.deadband.max_age - now,
+                    self._async_max_age_reached,
+                )
+            return
+        self._async_write_value(value, now)
+
+    @callback
+    def _async_write_value(self, value: Any, now: float) -> None:
+        self._async_cancel_max_age()
+        self._attr_native_value = value
+        self._written_at = now
+        self._written_available = self.available
         self.async_write_ha_state()
 
+    @callback
+    def _async_max_age_reached(self, _now: datetime) -> None:
+        self._cancel_max_age = None
+        self._async_write_value(
+            self.entity_description.value_fn(self.coordinator.snapshot),
+            time.monotonic(),
+        )
+
+    @callback
+    def _async_cancel_max_age(self) -> None:
+        if self._cancel_max_age is not None:
+            self._cancel_max_age()
+            self._cancel_max_age = None
+
+    def _within_deadband(self, value: Any, now: float) -> bool:
+        """Return if the change is too small to be written."""
+        unit = self.entity_description.deadband_unit
+        old = self._attr_native_value
+        return (
+            unit is not None
+            and self._written_available == self.available
+            and isinstance(value, int | float)
+            and isinstance(old, int | float)
+            and self.coordinator.deadband.suppresses(
+                unit, old, value, now - self._written_at
+            )
+        )
+
 
 class BinarySensor(CoordinatorEntity[ESSCoordinator], BinarySensorEntity):
     """Binary sensor."""
 
-    _group: str | None
-    _key: str
+    entity_description: EssBinarySensorEntityDescription
 
     def __init__(
         self,
-        coordinator,
+        coordinator: ESSCoordinator,
         device_info: DeviceInfo,
-        group: str | None,
-        key: str,
-        icon: str | None = None,
+        description: EssBinarySensorEntityDescription,
     ) -> None:
         """Initialize the sensor with the coordinator."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=description.data_keys)
+        self.entity_description = description
         self._attr_device_info = device_info
-        self._group = group
-        self._key = key
-        if group is None:
-            entity = key
-        else:
-            entity = group + "_" + key
-        self._attr_translation_key = entity
-        self._attr_unique_id = f"${device_info["serial_number"]}_${entity}"
-        self._attr_icon = icon
-        self.entity_id = f"binary_sensor.${DOMAIN}_${entity}"
+        self._attr_unique_id = _unique_id(device_info["serial_number"], description.key)
+        self.entity_id = f"binary_sensor.${DOMAIN}_${description.key}"
+
+    async def async_added_to_hass(self) -> None:
+        """Take the current value, later updates only arrive on changes."""
+        await super().async_added_to_hass()
+        self._handle_coordinator_update()
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        if self._group is None:
-            val = self.coordinator.data[self._key]
-        else:
-            val = self.coordinator.data[self._group][self._key]
-        self.is_on = (val == "on") | (val == "true") | (val == "1")
+        self._attr_is_on = self.entity_description.is_on_fn(self.coordinator.snapshot)
         self.async_write_ha_state()
 
 
-class MeasurementSensor(EssSensor):
-    """Measurement sensor."""
+class PollingIntervalSensor(CoordinatorEntity[ESSCoordinator], SensorEntity):
+    """Effective polling interval of a coordinator."""
 
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
     _attr_state_class = SensorStateClass.MEASUREMENT
 
     def __init__(
         self,
         coordinator,
         device_info: DeviceInfo,
-        group: str | None,
         key: str,
-        unit: str | None = None,
-        modify=None,
-        icon: str | None = None,
     ) -> None:
-        """Initialize the sensor with the common coordinator."""
-        super().__init__(coordinator, device_info, group, key, modify, icon=icon)
-        self._attr_native_unit_of_measurement = unit
+        """Initialize the sensor with the coordinator."""
+        super().__init__(coordinator, context=(INTERVAL_KEY,))
+        self._attr_device_info = device_info
+        self._attr_translation_key = key
+        self._attr_unique_id = _unique_id(device_info["serial_number"], key)
+        self.entity_id = f"sensor.${DOMAIN}_${key}"
 
+    @property
+    def native_value(self) -> float | None:
+        """Return the current interval in seconds."""
+        if self.coordinator.update_interval is None:
+            return None
+        return self.coordinator.update_interval.total_seconds()
 
-class IncreasingSensor(EssSensor):
-    """Increasing total sensor."""
 
-    _attr_state_class = SensorStateClass.TOTAL_INCREASING
-    _attr_device_class = SensorDeviceClass.ENERGY
+class LastPollSensor(CoordinatorEntity[ESSCoordinator], SensorEntity):
+    """Time of the last successful poll of a coordinator."""
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
 
     def __init__(
         self,
         coordinator,
         device_info: DeviceInfo,
-        group: str | None,
         key: str,
-        unit=UnitOfEnergy.WATT_HOUR,
-        icon: str | None = None,
     ) -> None:
         """Initialize the sensor with the coordinator."""
-        super().__init__(coordinator, device_info, group, key, icon=icon)
-        self._attr_native_unit_of_measurement = unit
-
-
-class IncreasingEnergySensor(IncreasingSensor):
-    """Increasing energy Wh sensor."""
+        super().__init__(coordinator, context=(POLLED_KEY,))
+        self._attr_device_info = device_info
+        self._attr_translation_key = key
+        self._attr_unique_id = _unique_id(device_info["serial_number"], key)
+        self.entity_id = f"sensor.${DOMAIN}_${key}"
 
-    def __init__(
-        self,
-        coordinator,
-        device_info: DeviceInfo,
-        group: str | None,
-        key: str,
-        icon: str | None = None,
-    ) -> None:
-        """Initialize the energy sensor with the coordinator."""
-        super().__init__(
-            coordinator, device_info, group, key, UnitOfEnergy.WATT_HOUR, icon=icon
-        )
-        self._attr_suggested_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+    @property
+    def native_value(self) -> datetime | None:
+        """Return the time of the last successful poll."""
+        return self.coordinator.polled_at
 
 
-class DirectionalPowerSensor(CoordinatorEntity[ESSCoordinator], SensorEntity):
-    """Calculate the directional power."""
+class CircuitBreakerSensor(SensorEntity):
+    """State of the circuit breaker guarding the requests to the device."""
 
-    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_options = [state.value for state in BreakerState]
+    _attr_should_poll = False
 
     def __init__(
         self,
-        coordinator,
+        breaker: CircuitBreaker,
         device_info: DeviceInfo,
         key: str,
-        direction_key: str,
-        source_key: str,
     ) -> None:
-        """Initialize the sensor with the common coordinator."""
-        super().__init__(coordinator)
+        """Initialize the sensor with the breaker."""
+        self._breaker = breaker
         self._attr_device_info = device_info
-        self._direction_key = direction_key
-        self._source_key = source_key
         self._attr_translation_key = key
-        self._attr_unique_id = f"${device_info["serial_number"]}_${key}"
+        self._attr_unique_id = _unique_id(device_info["serial_number"], key)
         self.entity_id = f"sensor.${DOMAIN}_${key}"
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        factor = 1
-        if self.coordinator.data["direction"][self._direction_key] == "1":
-            factor = -1
-        self._attr_native_value = (
-            int(self.coordinator.data["statistics"][self._source_key]) * factor
+    async def async_added_to_hass(self) -> None:
+        """Listen for state changes of the breaker."""
+        self.async_on_remove(
+            self._breaker.async_add_listener(self.async_write_ha_state)
         )
-        self.async_write_ha_state()
-
 
-def _parse_date(raw_input: str) -> date:
-    return datetime.strptime(raw_input, "%Y-%m-%d").date()
+    @property
+    def native_value(self) -> str:
+        """Return the state of the breaker."""
+        return self._breaker.state.value
@@ -0,0 +1,121 @@
+"""Websocket API streaming the decoded polls of LG ESS."""
+
+from collections.abc import Mapping
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_METRICS,
+    DOMAIN,
+    SIGNAL_ENTRY_UNLOADED,
+)
+from .coordinator import EssData, EssKey, SampleCallback
+from .history import metric_name
+
+ATTR_CHANGES_ONLY = "changes_only"
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the websocket commands of LG ESS."""
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Required(ATTR_CONFIG_ENTRY_ID): str,
+        vol.Optional(ATTR_METRICS): [str],
+        vol.Optional(ATTR_CHANGES_ONLY, default=True): bool,
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream each decoded poll of the home and common data.
+
+    Events are handed to the connection right away. Its writer buffers them
+    and closes the connection of a client that does not keep up, which ends
+    the subscription, so a stalled client never holds back the polls.
+
+    The subscription ends with an error when the config entry unloads, a
+    reload needs a new subscription to the new coordinators.
+    """
+    entry_id = msg[ATTR_CONFIG_ENTRY_ID]
+    data: EssData | None = hass.data.get(DOMAIN, {}).get(entry_id)
+    if data is None:
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            f"Config entry {entry_id} is not loaded",
+        )
+        return
+
+    wanted = set(msg[ATTR_METRICS]) if ATTR_METRICS in msg else None
+    changes_only = msg[ATTR_CHANGES_ONLY]
+
+    def _values(values: Mapping[EssKey, Any]) -> dict[str, Any]:
+        named = {metric_name(key): value for key, value in values.items()}
+        if wanted is None:
+            return named
+        return {name: value for name, value in named.items() if name in wanted}
+
+    @callback
+    def _async_send(name: str, values: Mapping[EssKey, Any]) -> None:
+        if not (event := _values(values)):
+            return
+        connection.send_event(
+            msg["id"], {"coordinator": name, "timestamp": time.time(), "values": event}
+        )
+
+    def _sample_callback(name: str) -> SampleCallback:
+        @callback
+        def _async_sample(
+            sample: Mapping[EssKey, Any], changed: Mapping[EssKey, Any]
+        ) -> None:
+            _async_send(name, changed if changes_only else sample)
+
+        return _async_sample
+
+    coordinators = {"home": data.home, "common": data.common}
+    unsubscribes = [
+        coordinator.async_subscribe_samples(_sample_callback(name))
+        for name, coordinator in coordinators.items()
+    ]
+
+    @callback
+    def _async_unsubscribe() -> None:
+        for unsubscribe in unsubscribes:
+            unsubscribe()
+
+    @callback
+    def _async_entry_unloaded() -> None:
+        if (unsubscribe := connection.subscriptions.pop(msg["id"], None)) is None:
+            return
+        unsubscribe()
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            f"Config entry {entry_id} was unloaded",
+        )
+
+    unsubscribes.append(
+        async_dispatcher_connect(
+            hass, SIGNAL_ENTRY_UNLOADED.format(entry_id), _async_entry_unloaded
+        )
+    )
+    connection.subscriptions[msg["id"]] = _async_unsubscribe
+    connection.send_result(msg["id"])
+    # Start with the complete last poll of both coordinators
+    for name, coordinator in coordinators.items():
+        _async_send(name, coordinator.sample)
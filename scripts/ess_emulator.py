@@ -0,0 +1,502 @@
+"""Emulate LG ESS devices for offline tests and benchmarks.
+
+Serves the HTTPS JSON API of the device: login, time sync and the
+systeminfo, home and common state. Every unit listens on its own port, add
+it to Home Assistant with the host 127.0.0.1:<port> and the password.
+
+    python scripts/ess_emulator.py --units 20 --port 8443 --scenario slow.json
+
+A scenario file scripts how the units answer. All keys are optional:
+
+    {
+        "latency": [0.2, 1.5],
+        "timeout_rate": 0.01,
+        "error_rate": 0.01,
+        "malformed_rate": 0.001,
+        "auth_expiry": 600,
+        "trajectories": {
+            "home.statistics.pcs_pv_total_power": {
+                "period": 600,
+                "points": [[0, 0], [300, 4500], [600, 0]]
+            }
+        },
+        "phases": [{"start": 120, "end": 180, "timeout_rate": 1}]
+    }
+
+A phase overrides the behaviour between start and end, in seconds since the
+emulator started. A trajectory moves a value of a state ("state.group.key",
+or "state.key" for the top level values) along the line through its points,
+repeating after period if given. The request counts of a unit are served as
+JSON at /emulator/stats.
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+from copy import deepcopy
+from dataclasses import dataclass, field, fields, replace
+import datetime
+from functools import partial
+import json
+import logging
+from pathlib import Path
+import random
+import secrets
+import ssl
+import tempfile
+import time
+from typing import Any
+
+from aiohttp import web
+
+_LOGGER = logging.getLogger("ess_emulator")
+
+DEFAULT_PASSWORD = "emulator"
+DEFAULT_PORT = 8443
+
+# Shapes as documented in custom_components/lg_ess/coordinator.py
+SYSTEMINFO: dict[str, Any] = {
+    "pms": {
+        "model": "ESS-EMULATOR",
+        "serialno": "",
+        "ac_input_power": "13500",
+        "ac_output_power": "10",
+        "install_date": "2020-01-01",
+    },
+    "batt": {
+        "capacity": "160",
+        "type": "hbp",
+        "hbc_cycle_count_1": "0",
+        "hbc_cycle_count_2": "0",
+        "install_date": "2020-01-01",
+    },
+    "version": {
+        "pms_version": "01.00.0000",
+        "pms_build_date": "2020-01-01 00000",
+        "pcs_version": "LG 05.00.01.00 0000 A.BBB.C",
+        "bms_version": "BMS 02.03.00.04 / DCDC 16.11.0.0 ",
+        "bms_unit1_version": "BMS 02.03.00.04 / DCDC 16.11.0.0 ",
+        "bms_unit2_version": " ",
+    },
+}
+HOME: dict[str, Any] = {
+    "statistics": {
+        "pcs_pv_total_power": "0",
+        "batconv_power": "540",
+        "bat_use": "1",
+        "bat_status": "2",
+        "bat_user_soc": "61.4",
+        "load_power": "541",
+        "ac_output_power": "10",
+        "load_today": "0.0",
+        "grid_power": "0",
+        "current_day_self_consumption": "81.6",
+        "current_pv_generation_sum": "26191",
+        "current_grid_feed_in_energy": "4810",
+    },
+    "direction": {
+        "is_direct_consuming_": "0",
+        "is_battery_charging_": "0",
+        "is_battery_discharging_": "1",
+        "is_grid_selling_": "0",
+        "is_grid_buying_": "0",
+        "is_charging_from_grid_": "0",
+        "is_discharging_to_grid_": "0",
+    },
+    "operation": {
+        "status": "start",
+        "mode": "1",
+        "pcs_standbymode": "false",
+        "drm_mode0": "0",
+        "remote_mode": "0",
+        "drm_control": "0",
+    },
+    "wintermode": {"winter_status": "off", "backup_status": "off"},
+    "backupmode": "",
+    "pcs_fault": {"pcs_status": "pcs_ok", "pcs_op_status": "pcs_run"},
+    "heatpump": {
+        "heatpump_protocol": "0",
+        "heatpump_activate": "off",
+        "current_temp": "0",
+        "heatpump_working": "off",
+    },
+    "evcharger": {"ev_activate": "off", "ev_power": "0"},
+    "gridWaitingTime": "0",
+}
+COMMON: dict[str, Any] = {
+    "PV": {
+        "brand": "LGE-SOLAR",
+        "capacity": "10935",
+        "pv1_voltage": "52.900002",
+        "pv2_voltage": "36.099998",
+        "pv3_voltage": "35.500000",
+        "pv1_power": "0",
+        "pv2_power": "1",
+        "pv3_power": "1",
+        "pv1_current": "0.010000",
+        "pv2_current": "0.030000",
+        "pv3_current": "0.030000",
+        "today_pv_generation_sum": "16294",
+        "today_month_pv_generation_sum": "17469",
+    },
+    "BATT": {
+        "status": "2",
+        "soc": "10.3",
+        "dc_power": "627",
+        "winter_setting": "off",
+        "winter_status": "off",
+        "safety_soc": "20",
+        "backup_setting": "off",
+        "backup_status": "off",
+        "backup_soc": "30",
+        "today_batt_discharge_enery": "6855",
+        "today_batt_charge_energy": "9050",
+        "month_batt_charge_energy": "9616",
+        "month_batt_discharge_energy": "9264",
+    },
+    "GRID": {
+        "active_power": "9",
+        "a_phase": "230.199997",
+        "freq": "50.020000",
+        "today_grid_feed_in_energy": "968",
+        "today_grid_power_purchase_energy": "7442",
+        "month_grid_feed_in_energy": "994",
+        "month_grid_power_purchase_energy": "13497",
+    },
+    "LOAD": {
+        "load_power": "638",
+        "today_load_consumption_sum": "20573",
+        "today_pv_direct_consumption_enegy": "6276",
+        "today_batt_discharge_enery": "6855",
+        "today_grid_power_purchase_energy": "7442",
+        "month_load_consumption_sum": "29620",
+        "month_pv_direct_consumption_energy": "6859",
+        "month_batt_discharge_energy": "9264",
+        "month_grid_power_purchase_energy": "13497",
+    },
+    "PCS": {
+        "today_self_consumption": "94.1",
+        "month_co2_reduction_accum": "12402",
+        "today_pv_generation_sum": "16294",
+        "today_grid_feed_in_energy": "968",
+        "month_pv_generation_sum": "17469",
+        "month_grid_feed_in_energy": "994",
+        "pcs_stauts": "3",
+        "feed_in_limitation": "100",
+        "operation_mode": "0",
+    },
+}
+
+# Path of each state below /v1/user/
+STATES = {
+    "systeminfo": ("setting/systeminfo", SYSTEMINFO),
+    "home": ("essinfo/home", HOME),
+    "common": ("essinfo/common", COMMON),
+}
+
+# Answer of the device to an unknown or expired auth key
+AUTH_FAILED = {"auth": "auth_key failed"}
+
+# Values sent instead of a reading with the malformed rate
+MALFORMED = ("", "nan", "--", "null")
+
+
+@dataclass(frozen=True)
+class Behaviour:
+    """How a unit answers, at the top of a scenario or within a phase."""
+
+    # Seconds before answering, a pair is a uniform range
+    latency: float | tuple[float, float] = 0.0
+    # Share of requests held for the hang time before they are answered
+    timeout_rate: float = 0.0
+    hang: float = 120.0
+    # Share of requests answered with an HTML server error
+    error_rate: float = 0.0
+    # Share of the values replaced by garbage
+    malformed_rate: float = 0.0
+    # Seconds an auth key is accepted, None keeps it valid until the next login
+    auth_expiry: float | None = None
+
+
+@dataclass(frozen=True)
+class Phase:
+    """Behaviour overridden between two moments."""
+
+    start: float
+    end: float | None
+    overrides: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class Trajectory:
+    """Value moving along the line through its (seconds, value) points."""
+
+    points: tuple[tuple[float, float], ...]
+    period: float | None = None
+
+    def value_at(self, elapsed: float) -> float:
+        """Return the value the given seconds after the start."""
+        if self.period:
+            elapsed %= self.period
+        points = self.points
+        if elapsed <= points[0][0]:
+            return points[0][1]
+        for (start, low), (end, high) in zip(points, points[1:]):
+            if elapsed <= end:
+                return low + (high - low) * (elapsed - start) / (end - start)
+        return points[-1][1]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Scripted behaviour and values of the units."""
+
+    behaviour: Behaviour = Behaviour()
+    phases: tuple[Phase, ...] = ()
+    # Path (state, group, key) or (state, key) of the value
+    trajectories: dict[tuple[str, ...], Trajectory] = field(default_factory=dict)
+
+    def behaviour_at(self, elapsed: float) -> Behaviour:
+        """Return the behaviour the given seconds after the start."""
+        behaviour = self.behaviour
+        for phase in self.phases:
+            if phase.start <= elapsed and (phase.end is None or elapsed < phase.end):
+                behaviour = replace(behaviour, **phase.overrides)
+        return behaviour
+
+
+def _behaviour_options(options: dict[str, Any]) -> dict[str, Any]:
+    names = {option.name for option in fields(Behaviour)}
+    if unknown := options.keys() - names:
+        raise ValueError(f"unknown behaviour {', '.join(sorted(unknown))}")
+    if isinstance(latency := options.get("latency"), list):
+        options = {**options, "latency": tuple(latency)}
+    return options
+
+
+def load_scenario(path: Path) -> Scenario:
+    """Read a scenario file, raises ValueError if it is invalid."""
+    options = json.loads(path.read_text())
+    phases = tuple(
+        Phase(
+            start=phase.pop("start", 0),
+            end=phase.pop("end", None),
+            overrides=_behaviour_options(phase),
+        )
+        for phase in options.pop("phases", [])
+    )
+    trajectories = {}
+    for name, trajectory in options.pop("trajectories", {}).items():
+        keys = tuple(name.split(".", 2))
+        if len(keys) < 2 or keys[0] not in STATES:
+            raise ValueError(f"unknown value {name}")
+        points = tuple(sorted((float(t), float(v)) for t, v in trajectory["points"]))
+        if not points:
+            raise ValueError(f"no points for {name}")
+        trajectories[keys] = Trajectory(points, trajectory.get("period"))
+    return Scenario(Behaviour(**_behaviour_options(options)), phases, trajectories)
+
+
+def _format(template: str, value: float) -> str:
+    """Format a value with the decimals the device uses for it."""
+    if "." in template:
+        return f"{value:.{len(template.split('.')[1])}f}"
+    return str(round(value))
+
+
+class Unit:
+    """One emulated device."""
+
+    def __init__(
+        self, index: int, password: str, scenario: Scenario, seed: int | None
+    ) -> None:
+        """Initialize the unit with its own serial number and random stream."""
+        self.serial = f"EMU{index:013d}"
+        self._password = password
+        self._scenario = scenario
+        self._random = random.Random(None if seed is None else seed + index)
+        self._started = time.monotonic()
+        self._auth_key: str | None = None
+        self._issued = 0.0
+        self.requests: Counter[str] = Counter()
+
+    def app(self) -> web.Application:
+        """Return the web application serving the API of the unit."""
+        app = web.Application()
+        app.router.add_put("/v1/user/setting/login", self._login)
+        app.router.add_put("/v1/user/setting/timesync", self._timesync)
+        for state, (path, _) in STATES.items():
+            app.router.add_post(f"/v1/user/{path}", partial(self._state, state))
+        app.router.add_get("/emulator/stats", self._stats)
+        return app
+
+    def _elapsed(self) -> float:
+        return time.monotonic() - self._started
+
+    async def _answer(self, name: str) -> tuple[Behaviour, web.Response | None]:
+        """Wait as scripted, return a server error if one is due."""
+        self.requests[name] += 1
+        behaviour = self._scenario.behaviour_at(self._elapsed())
+        delay = behaviour.latency
+        if isinstance(delay, tuple):
+            delay = self._random.uniform(*delay)
+        if self._random.random() < behaviour.timeout_rate:
+            delay = behaviour.hang
+        if delay:
+            await asyncio.sleep(delay)
+        if self._random.random() < behaviour.error_rate:
+            self.requests["errors"] += 1
+            return behaviour, web.Response(status=500, text="<html>Error</html>")
+        return behaviour, None
+
+    def _authorized(self, body: dict[str, Any], behaviour: Behaviour) -> bool:
+        if self._auth_key is None or body.get("auth_key") != self._auth_key:
+            return False
+        expiry = behaviour.auth_expiry
+        return expiry is None or time.monotonic() - self._issued < expiry
+
+    async def _login(self, request: web.Request) -> web.Response:
+        _, error = await self._answer("login")
+        if error is not None:
+            return error
+        body = await request.json()
+        if body.get("password") != self._password:
+            return web.json_response({"status": "password mismatched"})
+        # A new login replaces the previous key
+        self._auth_key = secrets.token_hex(16)
+        self._issued = time.monotonic()
+        return web.json_response({"status": "success", "auth_key": self._auth_key})
+
+    async def _timesync(self, request: web.Request) -> web.Response:
+        behaviour, error = await self._answer("timesync")
+        if error is not None:
+            return error
+        if not self._authorized(await request.json(), behaviour):
+            return web.json_response(AUTH_FAILED, status=401)
+        return web.json_response({"status": "success"})
+
+    async def _state(self, state: str, request: web.Request) -> web.Response:
+        behaviour, error = await self._answer(state)
+        if error is not None:
+            return error
+        if not self._authorized(await request.json(), behaviour):
+            self.requests["auth_failed"] += 1
+            return web.json_response(AUTH_FAILED, status=401)
+        return web.json_response(self._payload(state, behaviour))
+
+    def _payload(self, state: str, behaviour: Behaviour) -> dict[str, Any]:
+        payload = deepcopy(STATES[state][1])
+        if state == "systeminfo":
+            payload["pms"]["serialno"] = self.serial
+        elapsed = self._elapsed()
+        for path, trajectory in self._scenario.trajectories.items():
+            if path[0] != state:
+                continue
+            *groups, key = path[1:]
+            values = payload[groups[0]] if groups else payload
+            values[key] = _format(values.get(key, "0"), trajectory.value_at(elapsed))
+        if behaviour.malformed_rate:
+            self._malform(payload, behaviour.malformed_rate)
+        return payload
+
+    def _malform(self, values: dict[str, Any], rate: float) -> None:
+        for key, value in values.items():
+            if isinstance(value, dict):
+                self._malform(value, rate)
+            elif self._random.random() < rate:
+                values[key] = self._random.choice(MALFORMED)
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"serial": self.serial, "uptime": self._elapsed(), **self.requests}
+        )
+
+
+def self_signed_certificate() -> tuple[Path, Path]:
+    """Write a self-signed certificate, the integration does not verify it."""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "ess-emulator")])
+    now = datetime.datetime.now(datetime.UTC)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=365))
+        .sign(key, hashes.SHA256())
+    )
+    directory = Path(tempfile.mkdtemp(prefix="ess_emulator_"))
+    certfile, keyfile = directory / "cert.pem", directory / "key.pem"
+    certfile.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+    keyfile.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    return certfile, keyfile
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """Serve the units until cancelled."""
+    scenario = Scenario() if args.scenario is None else load_scenario(args.scenario)
+    if args.certfile is None:
+        certfile, keyfile = self_signed_certificate()
+    else:
+        certfile, keyfile = args.certfile, args.keyfile
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(certfile, keyfile)
+
+    runners = []
+    try:
+        for index in range(args.units):
+            unit = Unit(index, args.password, scenario, args.seed)
+            runner = web.AppRunner(unit.app(), access_log=None)
+            await runner.setup()
+            runners.append(runner)
+            await web.TCPSite(
+                runner, args.host, args.port + index, ssl_context=context
+            ).start()
+        _LOGGER.info(
+            "Emulating %s units on %s ports %s-%s with the password %r",
+            args.units,
+            args.host,
+            args.port,
+            args.port + args.units - 1,
+            args.password,
+        )
+        await asyncio.Event().wait()
+    finally:
+        for runner in runners:
+            await runner.cleanup()
+
+
+def main() -> None:
+    """Parse the arguments and run the emulator."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--units", type=int, default=1)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--scenario", type=Path)
+    parser.add_argument("--seed", type=int, help="repeat the same random answers")
+    parser.add_argument("--certfile", type=Path)
+    parser.add_argument("--keyfile", type=Path)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""Tests for the LG ESS integration."""
+
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.lg_ess.const import DOMAIN
+
+from .const import SERIAL
+
+
+def entity_id(hass: HomeAssistant, key: str) -> str:
+    """Return the entity id of the sensor with the key."""
+    entity_id = er.async_get(hass).async_get_entity_id(
+        Platform.SENSOR, DOMAIN, f"${SERIAL}_${key}"
+    )
+    assert entity_id is not None
+    return entity_id
@@ -0,0 +1,75 @@
+"""Fixtures for the LG ESS tests."""
+
+from collections.abc import Generator
+import copy
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_HOST, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+
+from custom_components.lg_ess.client import PooledESS
+from custom_components.lg_ess.const import DOMAIN
+
+from .const import HOST, PASSWORD, PAYLOADS, SERIAL
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(
+    recorder_mock: Any, enable_custom_integrations: None
+) -> None:
+    """Enable the integration and the recorder it depends on in all tests."""
+
+
+@pytest.fixture
+def payloads() -> dict[str, dict[str, Any]]:
+    """Return the payloads of the mocked device, tests may change them."""
+    return copy.deepcopy(PAYLOADS)
+
+
+@pytest.fixture
+def mock_ess(payloads: dict[str, dict[str, Any]]) -> Generator[None]:
+    """Answer the requests of the client from the payloads."""
+
+    async def get_state(self: PooledESS, state: str, timeout: float | None = None):
+        return copy.deepcopy(payloads[state])
+
+    with (
+        patch.object(PooledESS, "async_login", autospec=True),
+        patch.object(PooledESS, "get_state", get_state),
+    ):
+        yield
+
+
+@pytest.fixture
+def options() -> dict[str, Any]:
+    """Return the options of the config entry."""
+    return {}
+
+
+@pytest.fixture
+def mock_config_entry(hass: HomeAssistant, options: dict[str, Any]) -> MockConfigEntry:
+    """Return the config entry of the mocked device, not set up yet."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="LG ESS",
+        unique_id=SERIAL,
+        data={CONF_HOST: HOST, CONF_PASSWORD: PASSWORD},
+        options=options,
+        version=2,
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.fixture
+async def config_entry(
+    hass: HomeAssistant, mock_ess: None, mock_config_entry: MockConfigEntry
+) -> MockConfigEntry:
+    """Set up the integration against the mocked device."""
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    return mock_config_entry
@@ -0,0 +1,19 @@
+"""Payloads of a device, shared with the emulator."""
+
+from copy import deepcopy
+from typing import Any
+
+from scripts import ess_emulator
+
+HOST = "192.168.0.10"
+PASSWORD = "password"
+SERIAL = "EMU0000000000000"
+
+# The emulator fills in the serial number of each unit
+SYSTEMINFO: dict[str, Any] = deepcopy(ess_emulator.SYSTEMINFO)
+SYSTEMINFO["pms"]["serialno"] = SERIAL
+
+HOME = ess_emulator.HOME
+COMMON = ess_emulator.COMMON
+
+PAYLOADS = {"systeminfo": SYSTEMINFO, "home": HOME, "common": COMMON}
@@ -0,0 +1,152 @@
+"""Tests for the client of the LG ESS api."""
+
+import asyncio
+import time
+from unittest.mock import Mock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from custom_components.lg_ess.client import (
+    AUTH_FAILED,
+    BACKOFF_MAX,
+    BACKOFF_MIN,
+    FAILURE_THRESHOLD,
+    BreakerState,
+    CircuitBreaker,
+    CircuitOpenError,
+    PooledESS,
+)
+
+from .const import HOST, PASSWORD
+
+
+def _trip(breaker: CircuitBreaker) -> None:
+    for _ in range(FAILURE_THRESHOLD):
+        breaker.async_before_request()
+        breaker.async_failure()
+
+
+def test_breaker_opens_after_failures(freezer: FrozenDateTimeFactory) -> None:
+    """Consecutive failures open the breaker until the backoff passed."""
+    breaker = CircuitBreaker()
+    listener = Mock()
+    breaker.async_add_listener(listener)
+
+    for _ in range(FAILURE_THRESHOLD - 1):
+        breaker.async_before_request()
+        breaker.async_failure()
+    assert breaker.state is BreakerState.CLOSED
+
+    breaker.async_before_request()
+    breaker.async_failure()
+    assert breaker.state is BreakerState.OPEN
+    listener.assert_called_once()
+    with pytest.raises(CircuitOpenError):
+        breaker.async_before_request()
+
+
+def test_breaker_probe(freezer: FrozenDateTimeFactory) -> None:
+    """Once half open, a single probe decides about the breaker."""
+    breaker = CircuitBreaker()
+    _trip(breaker)
+
+    freezer.tick(BACKOFF_MAX)
+    breaker.async_before_request()
+    assert breaker.state is BreakerState.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.async_before_request()
+
+    breaker.async_success()
+    assert breaker.state is BreakerState.CLOSED
+    breaker.async_before_request()
+
+
+def test_breaker_failed_probe_doubles_backoff(freezer: FrozenDateTimeFactory) -> None:
+    """A failed probe opens the breaker again for twice the backoff."""
+    breaker = CircuitBreaker()
+    with patch("custom_components.lg_ess.client.random.uniform", return_value=1):
+        _trip(breaker)
+    assert breaker.retry_at - time.monotonic() == 1
+
+    freezer.tick(BACKOFF_MIN)
+    breaker.async_before_request()
+    with patch(
+        "custom_components.lg_ess.client.random.uniform", side_effect=max
+    ) as uniform:
+        breaker.async_failure()
+    uniform.assert_called_once_with(BACKOFF_MIN, 2 * BACKOFF_MIN)
+    assert breaker.state is BreakerState.OPEN
+
+
+def test_breaker_release_ends_probe(freezer: FrozenDateTimeFactory) -> None:
+    """A probe without a verdict lets the next request probe."""
+    breaker = CircuitBreaker()
+    _trip(breaker)
+
+    freezer.tick(BACKOFF_MAX)
+    breaker.async_before_request()
+    breaker.async_release()
+    breaker.async_before_request()
+    assert breaker.state is BreakerState.HALF_OPEN
+
+
+async def test_requests_coalesce() -> None:
+    """A request for a state in flight shares its response."""
+    ess = PooledESS(Mock(), PASSWORD, HOST)
+    release = asyncio.Event()
+
+    async def post(url: str, timeout: float | None = None) -> dict:
+        await release.wait()
+        return {"url": url}
+
+    with patch.object(ess, "post_json_with_auth", side_effect=post) as post_json:
+        first = asyncio.ensure_future(ess.get_state("home"))
+        second = asyncio.ensure_future(ess.get_state("home"))
+        await asyncio.sleep(0)
+        # A cancelled caller leaves the shared request to the others
+        first.cancel()
+        release.set()
+        home = await second
+        common = await ess.get_state("common")
+    assert post_json.call_count == 2
+    assert home != common
+    assert not ess._pending
+
+
+class _Response:
+    """Response of the fake device to a request with an auth key."""
+
+    def __init__(self, valid: bool) -> None:
+        self.status = 200 if valid else 401
+        self._body = {"ok": True} if valid else AUTH_FAILED[0]
+
+    async def __aenter__(self) -> "_Response":
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        """Release nothing."""
+
+    async def json(self) -> dict:
+        return self._body
+
+
+async def test_single_relogin() -> None:
+    """Requests rejected for the same expired key log in only once."""
+    session = Mock()
+    session.post = lambda url, json, timeout: _Response(json["auth_key"] == "new")
+    ess = PooledESS(session, PASSWORD, HOST)
+    ess.auth_key = "expired"
+
+    async def login(timeout: float | None = None) -> str:
+        await asyncio.sleep(0)
+        ess.auth_key = "new"
+        return ess.auth_key
+
+    with patch.object(ess, "async_login", side_effect=login) as async_login:
+        responses = await asyncio.gather(
+            ess.post_json_with_auth("home"), ess.post_json_with_auth("common")
+        )
+    assert responses == [{"ok": True}, {"ok": True}]
+    async_login.assert_called_once()
@@ -0,0 +1,112 @@
+"""Tests for the config and options flows of LG ESS."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from pyess.aio_ess import ESSAuthException
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.const import CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.util import dt as dt_util
+
+from custom_components.lg_ess.client import DATA_CLIENTS, UNCLAIMED_TIMEOUT
+
+from custom_components.lg_ess.const import (
+    CONF_COMMON_INTERVAL,
+    CONF_DEADBAND_POWER,
+    CONF_HOME_INTERVAL,
+    CONF_PROFILE,
+    CONF_SYSTEMINFO_INTERVAL,
+    DOMAIN,
+    PROFILE_CUSTOM,
+    PROFILE_REALTIME,
+)
+
+from .const import HOST
+
+
+async def _start_options(hass: HomeAssistant, entry: MockConfigEntry, profile: str):
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "init"
+    return await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_PROFILE: profile}
+    )
+
+
+async def test_options_profile(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """A profile goes on to the deadband and applies without a reload."""
+    home = hass.data[DOMAIN][config_entry.entry_id].home
+    result = await _start_options(hass, config_entry, PROFILE_REALTIME)
+    assert result["step_id"] == "deadband"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_DEADBAND_POWER: 25}
+    )
+    await hass.async_block_till_done()
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert config_entry.options[CONF_PROFILE] == PROFILE_REALTIME
+    assert config_entry.options[CONF_DEADBAND_POWER] == 25
+    assert hass.data[DOMAIN][config_entry.entry_id].home is home
+    assert home.update_interval == timedelta(seconds=5)
+    assert home.deadband.absolute["W"] == 25
+
+
+async def test_options_custom(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """The custom profile asks for the intervals before the deadband."""
+    result = await _start_options(hass, config_entry, PROFILE_CUSTOM)
+    assert result["step_id"] == "custom"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {CONF_HOME_INTERVAL: 7, CONF_COMMON_INTERVAL: 60, CONF_SYSTEMINFO_INTERVAL: 12},
+    )
+    assert result["step_id"] == "deadband"
+    result = await hass.config_entries.options.async_configure(result["flow_id"], {})
+    await hass.async_block_till_done()
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    data = hass.data[DOMAIN][config_entry.entry_id]
+    assert data.home.update_interval == timedelta(seconds=7)
+    assert data.common.update_interval == timedelta(seconds=60)
+
+
+async def test_reauth(hass: HomeAssistant, config_entry: MockConfigEntry) -> None:
+    """A rejected password is asked again, then the entry is updated."""
+    result = await config_entry.start_reauth_flow(hass)
+    assert result["step_id"] == "reauth_confirm"
+
+    with patch(
+        "custom_components.lg_ess.config_flow.async_get_ess",
+        side_effect=ESSAuthException("wrong password"),
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_PASSWORD: "wrong"}
+        )
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "invalid_auth"}
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_PASSWORD: "new password"}
+    )
+    await hass.async_block_till_done()
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "reauth_successful"
+    assert config_entry.data[CONF_PASSWORD] == "new password"
+
+    # The reloaded entry claimed the client logged in by the flow
+    ess = hass.data[DOMAIN][config_entry.entry_id].ess
+    assert ess.pw == "new password"
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=UNCLAIMED_TIMEOUT)
+    )
+    await hass.async_block_till_done()
+    assert hass.data[DATA_CLIENTS][HOST] is ess
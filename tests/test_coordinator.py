@@ -0,0 +1,212 @@
+"""Tests for the LG ESS coordinators."""
+
+from datetime import timedelta
+from typing import Any
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import UnitOfPower
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.lg_ess.client import PooledESS
+from custom_components.lg_ess.const import (
+    CONF_AGGREGATION_WINDOW,
+    CONF_DEADBAND_MAX_AGE,
+    CONF_DEADBAND_POWER,
+    CONF_DEADBAND_RELATIVE,
+    CONF_PROFILE,
+    DOMAIN,
+    PROFILE_REALTIME,
+    SERVICE_START_LIVE_MODE,
+    SERVICE_STOP_LIVE_MODE,
+)
+from custom_components.lg_ess.coordinator import WINDOW_SAMPLE_INTERVAL, deadband
+
+from . import entity_id
+from .const import HOME
+
+
+@pytest.mark.parametrize(
+    ("options", "deadline"),
+    [
+        ({}, 8),
+        ({CONF_PROFILE: PROFILE_REALTIME}, 4),
+    ],
+)
+async def test_deadline(
+    hass: HomeAssistant, config_entry: MockConfigEntry, deadline: float
+) -> None:
+    """A fetch ends before the next poll of the profile is due."""
+    home = hass.data[DOMAIN][config_entry.entry_id].home
+    with patch.object(PooledESS, "get_state", return_value=HOME) as get_state:
+        await home.async_refresh()
+    get_state.assert_called_once_with("home", deadline)
+
+
+@pytest.mark.parametrize(("interval", "deadline"), [(1, 0.8), (2, 1.6)])
+async def test_live_deadline(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    interval: int,
+    deadline: float,
+) -> None:
+    """Live mode bounds a fetch by the live interval."""
+    home = hass.data[DOMAIN][config_entry.entry_id].home
+    home.async_start_live(timedelta(seconds=interval), timedelta(minutes=1))
+    with patch.object(PooledESS, "get_state", return_value=HOME) as get_state:
+        await home.async_refresh()
+    get_state.assert_called_once_with("home", deadline)
+    home.async_stop_live()
+
+
+async def test_live_mode_defers_other_keys(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    payloads: dict[str, dict[str, Any]],
+) -> None:
+    """Live mode only writes the power readings and catches up when it stops."""
+    home = hass.data[DOMAIN][config_entry.entry_id].home
+    load_power = entity_id(hass, "statistics_load_power")
+    soc = entity_id(hass, "statistics_bat_user_soc")
+    assert hass.states.get(soc).state == "61.4"
+
+    await hass.services.async_call(DOMAIN, SERVICE_START_LIVE_MODE, blocking=True)
+    payloads["home"]["statistics"]["load_power"] = "800"
+    payloads["home"]["statistics"]["bat_user_soc"] = "62.0"
+    await home.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(load_power).state == "800"
+    assert hass.states.get(soc).state == "61.4"
+
+    await hass.services.async_call(DOMAIN, SERVICE_STOP_LIVE_MODE, blocking=True)
+    await hass.async_block_till_done()
+    assert hass.states.get(soc).state == "62.0"
+
+
+@pytest.mark.parametrize("options", [{CONF_AGGREGATION_WINDOW: 60}])
+async def test_window_closes_on_unchanged_payload(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    config_entry: MockConfigEntry,
+    payloads: dict[str, dict[str, Any]],
+) -> None:
+    """The aggregates are dispatched when the payload repeats the last one."""
+    home = hass.data[DOMAIN][config_entry.entry_id].home
+    load_power = entity_id(hass, "statistics_load_power")
+    assert hass.states.get(load_power).state == "541"
+
+    for value in ("100", "300"):
+        payloads["home"]["statistics"]["load_power"] = value
+        freezer.tick(20)
+        await home.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(load_power).state == "541"
+
+    freezer.tick(30)
+    await home.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(load_power).state == "233.3"
+
+
+@pytest.mark.parametrize("options", [{CONF_AGGREGATION_WINDOW: 60}])
+async def test_window_samples_fast(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    config_entry: MockConfigEntry,
+    payloads: dict[str, dict[str, Any]],
+) -> None:
+    """A window samples the device quickly and publishes all values at its end."""
+    home = hass.data[DOMAIN][config_entry.entry_id].home
+    assert home.update_interval == WINDOW_SAMPLE_INTERVAL
+    load_power = entity_id(hass, "statistics_load_power")
+    soc = entity_id(hass, "statistics_bat_user_soc")
+
+    payloads["home"]["statistics"]["bat_user_soc"] = "62.0"
+    for value in ("100", "5000", "300"):
+        payloads["home"]["statistics"]["load_power"] = value
+        freezer.tick(WINDOW_SAMPLE_INTERVAL)
+        await home.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(load_power).state == "541"
+    assert hass.states.get(soc).state == "61.4"
+
+    freezer.tick(60)
+    await home.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(load_power).state == "1425.0"
+    assert hass.states.get(soc).state == "62.0"
+    assert home.sample[("statistics", "load_power")] == 300
+
+
+@pytest.mark.parametrize(
+    ("old", "new", "age", "suppressed"),
+    [
+        (500, 505, 10, True),
+        (500, 510, 10, False),
+        (500, 505, 300, False),
+        # Starting, stopping or reversing a flow is always written
+        (0, 5, 10, False),
+        (5, 0, 10, False),
+        (5, -5, 10, False),
+    ],
+)
+def test_deadband(old: float, new: float, age: float, suppressed: bool) -> None:
+    """Small changes of a measurement are held back until the maximum age."""
+    band = deadband({CONF_DEADBAND_POWER: 10, CONF_DEADBAND_MAX_AGE: 300})
+    assert band.suppresses(UnitOfPower.WATT, old, new, age) is suppressed
+
+
+def test_deadband_relative() -> None:
+    """The relative deadband widens the band of large values."""
+    band = deadband({CONF_DEADBAND_POWER: 10, CONF_DEADBAND_RELATIVE: 5})
+    assert band.suppresses(UnitOfPower.WATT, 1000, 1040, 0)
+    assert not band.suppresses(UnitOfPower.WATT, 1000, 1050, 0)
+    assert not band.suppresses(UnitOfPower.WATT, 100, 110, 0)
+
+
+async def test_dispatch_changed_keys(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    config_entry: MockConfigEntry,
+    payloads: dict[str, dict[str, Any]],
+) -> None:
+    """A poll only writes the entities of the changed keys and the last poll."""
+    home = hass.data[DOMAIN][config_entry.entry_id].home
+    load_power = entity_id(hass, "statistics_load_power")
+    soc = entity_id(hass, "statistics_bat_user_soc")
+    last_poll = entity_id(hass, "home_last_poll")
+    reported = hass.states.get(soc).last_reported
+
+    freezer.tick(10)
+    payloads["home"]["statistics"]["load_power"] = "800"
+    await home.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(load_power).state == "800"
+    assert hass.states.get(soc).last_reported == reported
+    assert hass.states.get(last_poll).last_reported == dt_util.utcnow()
+
+
+async def test_malformed_value(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    payloads: dict[str, dict[str, Any]],
+) -> None:
+    """A malformed value is unknown and logged once until it decodes again."""
+    home = hass.data[DOMAIN][config_entry.entry_id].home
+    load_power = entity_id(hass, "statistics_load_power")
+
+    with patch("custom_components.lg_ess.coordinator._LOGGER") as logger:
+        for value, state in (("--", "unknown"), ("nan", "unknown"), ("600", "600")):
+            payloads["home"]["statistics"]["load_power"] = value
+            await home.async_refresh()
+            await hass.async_block_till_done()
+            assert hass.states.get(load_power).state == state
+        assert logger.warning.call_count == 1
+
+        payloads["home"]["statistics"]["load_power"] = "--"
+        await home.async_refresh()
+        assert logger.warning.call_count == 2
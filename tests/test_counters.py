@@ -0,0 +1,120 @@
+"""Tests for the lifetime energy counters."""
+
+from datetime import datetime
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.lg_ess.counters import (
+    LIFETIME,
+    MONTH_SOURCES,
+    SOURCES,
+    EnergyCounters,
+)
+
+NAME = "grid_power_purchase_energy"
+
+
+def _local(day: int, hour: int, minute: int = 0, month: int = 5) -> datetime:
+    return datetime(
+        2024, month, day, hour, minute, tzinfo=dt_util.get_default_time_zone()
+    )
+
+
+@pytest.mark.parametrize(
+    ("readings", "total"),
+    [
+        # Increases within a day add up
+        ([(_local(1, 10), 1000, 5000), (_local(1, 11), 1500, 5500)], 1500),
+        # The reset is seen, the month covers the end of the day
+        (
+            [
+                (_local(1, 23, 50), 12000, 50000),
+                (_local(2, 0, 10), 500, 51000),
+            ],
+            12000 + 1000,
+        ),
+        # A downtime across midnight, today is already above yesterday
+        (
+            [
+                (_local(1, 20), 12000, 50000),
+                (_local(2, 13), 13000, 75000),
+            ],
+            12000 + 25000,
+        ),
+        # Without the month only the energy since midnight is known
+        ([(_local(1, 20), 12000, None), (_local(2, 13), 13000, None)], 25000),
+        # The device did not reset yet at the local midnight
+        ([(_local(1, 23), 12000, None), (_local(2, 0, 5), 12000, None)], 12000),
+        (
+            [
+                (_local(1, 23), 12000, 50000),
+                (_local(2, 0, 5), 12100, 50100),
+                (_local(2, 0, 10), 50, 50150),
+            ],
+            12000 + 150,
+        ),
+        # The month reset as well, only the energy since the first is known
+        ([(_local(1, 20), 12000, 50000), (_local(2, 13), 13000, 13000)], 25000),
+        (
+            [
+                (_local(30, 20, month=4), 12000, 450000),
+                (_local(2, 13), 13000, 40000),
+            ],
+            12000 + 40000,
+        ),
+        # A drop to zero within the day is a glitch
+        (
+            [
+                (_local(1, 10), 1000, 5000),
+                (_local(1, 11), 0, 0),
+                (_local(1, 12), 1500, 5500),
+            ],
+            1500,
+        ),
+        # So is a dip within the day the month does not follow
+        (
+            [
+                (_local(1, 10), 1000, 5000),
+                (_local(1, 11), 800, 5000),
+                (_local(1, 12), 1500, 5500),
+            ],
+            1500,
+        ),
+        # Without the month a drop within the day is still the late reset
+        (
+            [
+                (_local(2, 0, 5), 12100, None),
+                (_local(2, 0, 10), 50, None),
+            ],
+            12100 + 50,
+        ),
+        # An implausible jump only moves the baseline
+        (
+            [
+                (_local(1, 10), 1000, 5000),
+                (_local(1, 10, 5), 900000, 904000),
+                (_local(1, 11), 901000, 905000),
+            ],
+            2000,
+        ),
+    ],
+)
+async def test_lifetime_counter(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    readings: list[tuple[datetime, float, float | None]],
+    total: float,
+) -> None:
+    """The lifetime counter sums the daily counter across resets."""
+    counters = EnergyCounters(hass, "entry")
+    values = {}
+    for moment, today, month in readings:
+        freezer.move_to(moment)
+        values = counters.async_update(
+            {SOURCES[NAME]: today, MONTH_SOURCES[NAME]: month}
+        )
+    assert values == {(LIFETIME, NAME): total}
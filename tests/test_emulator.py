@@ -0,0 +1,67 @@
+"""Smoke tests of the client against the device emulator."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+import ssl
+
+import aiohttp
+from aiohttp import web
+import pytest
+
+from custom_components.lg_ess.client import PooledESS
+from scripts.ess_emulator import (
+    DEFAULT_PASSWORD,
+    Behaviour,
+    Scenario,
+    Unit,
+    self_signed_certificate,
+)
+
+from .const import HOME
+
+# Seconds an auth key of the emulated unit is accepted
+AUTH_EXPIRY = 0.5
+
+
+@pytest.fixture
+def unit() -> Unit:
+    """Return an emulated unit whose auth keys expire quickly."""
+    return Unit(0, DEFAULT_PASSWORD, Scenario(Behaviour(auth_expiry=AUTH_EXPIRY)), 0)
+
+
+@pytest.fixture
+async def host(socket_enabled: None, unit: Unit) -> AsyncGenerator[str]:
+    """Serve the unit on a free local port, return its host."""
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(*self_signed_certificate())
+    runner = web.AppRunner(unit.app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0, ssl_context=context).start()
+    yield f"127.0.0.1:{runner.addresses[0][1]}"
+    await runner.cleanup()
+
+
+@pytest.fixture
+async def ess(host: str) -> AsyncGenerator[PooledESS]:
+    """Return a client of the served unit."""
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(ssl=False)
+    ) as session:
+        yield PooledESS(session, DEFAULT_PASSWORD, host)
+
+
+async def test_emulator(unit: Unit, ess: PooledESS) -> None:
+    """Log in, share a request in flight and log in again once the key expired."""
+    await ess.async_login()
+    assert ess.logged_in
+
+    home, again = await asyncio.gather(ess.get_state("home"), ess.get_state("home"))
+    assert home == again == HOME
+    assert unit.requests["home"] == 1
+
+    await asyncio.sleep(AUTH_EXPIRY)
+    common, home = await asyncio.gather(ess.get_state("common"), ess.get_state("home"))
+    assert home == HOME
+    assert common["PV"]["capacity"] == "10935"
+    assert unit.requests["login"] == 2
+    assert unit.requests["auth_failed"] == 1
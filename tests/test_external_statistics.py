@@ -0,0 +1,146 @@
+"""Tests for the hourly statistics of the lifetime counters."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.lg_ess.external_statistics import (
+    MAX_BACKFILL_HOURS,
+    HourlyStatistics,
+)
+
+
+def _local(month: int, day: int, hour: int, minute: int = 0) -> datetime:
+    return datetime(
+        2024, month, day, hour, minute, tzinfo=dt_util.get_default_time_zone()
+    )
+
+
+def _utc(month: int, day: int, hour: int, minute: int = 0) -> datetime:
+    return dt_util.as_utc(_local(month, day, hour, minute))
+
+
+@pytest.mark.parametrize(
+    ("since", "now", "total", "state", "month", "sums"),
+    [
+        # Still in the hour of the anchor
+        (((5, 1, 10, 5), 1000), (5, 1, 10, 55), 1100, 200, 300, []),
+        # The hour ended between two polls
+        (((5, 1, 10, 30), 1000), (5, 1, 11, 30), 2000, 1100, 2100, [1500]),
+        # A downtime over midnight, the daily counter splits the gap
+        (
+            ((5, 1, 20), 0),
+            (5, 2, 2),
+            6000,
+            1000,
+            21000,
+            [1250, 2500, 3750, 5000, 5500, 6000],
+        ),
+        # Midnight of the local day, not of the day in UTC
+        (
+            ((5, 1, 20), 0),
+            (5, 2, 20),
+            10000,
+            4000,
+            21000,
+            [
+                *(6000 * hour / 4 for hour in range(1, 5)),
+                *(6000 + 4000 * hour / 20 for hour in range(1, 21)),
+            ],
+        ),
+        # Without the daily counter the gap is spread evenly
+        (
+            ((5, 1, 22), 0),
+            (5, 2, 2),
+            4000,
+            None,
+            None,
+            [1000, 2000, 3000, 4000],
+        ),
+        # A daily counter that does not fit the gap is ignored
+        (
+            ((5, 1, 22), 0),
+            (5, 2, 2),
+            4000,
+            5000,
+            21000,
+            [1000, 2000, 3000, 4000],
+        ),
+        # Over the end of a month, the monthly counter splits the gap as well
+        (
+            ((4, 30, 20), 0),
+            (5, 2, 2),
+            10000,
+            1000,
+            3000,
+            [
+                *(7000 * hour / 4 for hour in range(1, 5)),
+                *(7000 + 2000 * hour / 24 for hour in range(1, 25)),
+                9500,
+                10000,
+            ],
+        ),
+    ],
+)
+async def test_rows(
+    hass: HomeAssistant,
+    since: tuple[tuple[int, ...], float],
+    now: tuple[int, ...],
+    total: float,
+    state: float | None,
+    month: float | None,
+    sums: list[float],
+) -> None:
+    """The rows hold the lifetime counter at the end of each hour."""
+    statistics = HourlyStatistics(hass, "entry", "LG ESS")
+    moment, since_total = _utc(*since[0]), since[1]
+    rows = statistics._rows(
+        (moment.timestamp(), since_total, None),
+        _utc(*now),
+        total,
+        state,
+        month,
+    )
+    assert [row["sum"] for row in rows] == [round(value, 1) for value in sums]
+    assert [row["start"] for row in rows] == [
+        moment.replace(minute=0) + timedelta(hours=hour) for hour in range(len(sums))
+    ]
+
+
+async def test_rows_state(hass: HomeAssistant) -> None:
+    """A single row holds the daily counter of the last poll of its hour."""
+    statistics = HourlyStatistics(hass, "entry", "LG ESS")
+    since = _local(5, 1, 10, 50)
+    rows = statistics._rows(
+        (since.timestamp(), 1000, 100),
+        _utc(5, 1, 11, 5),
+        1300,
+        400,
+        500,
+    )
+    assert len(rows) == 1
+    assert rows[0]["state"] == 100
+
+    rows = statistics._rows(
+        (since.timestamp(), 1000, 100),
+        _utc(5, 1, 12, 5),
+        1300,
+        400,
+        500,
+    )
+    assert "state" not in rows[0]
+
+
+async def test_rows_backfill_limit(hass: HomeAssistant) -> None:
+    """Only the most recent hours of a long downtime are filled in."""
+    statistics = HourlyStatistics(hass, "entry", "LG ESS")
+    now = _local(5, 20, 12)
+    since = now - timedelta(hours=MAX_BACKFILL_HOURS + 10)
+    rows = statistics._rows(
+        (since.timestamp(), 0, None), dt_util.as_utc(now), 1000, None, None
+    )
+    assert len(rows) == MAX_BACKFILL_HOURS
+    assert rows[-1]["sum"] == 1000
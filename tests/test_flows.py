@@ -0,0 +1,103 @@
+"""Tests for the energy flows derived from the home data."""
+
+from typing import Any
+
+import pytest
+
+from custom_components.lg_ess.flows import (
+    BATTERY_POWER,
+    BATTERY_TO_GRID,
+    BATTERY_TO_LOAD,
+    DERIVED,
+    GRID_POWER,
+    GRID_TO_BATTERY,
+    GRID_TO_LOAD,
+    METRICS,
+    PV_TO_BATTERY,
+    PV_TO_GRID,
+    PV_TO_LOAD,
+    SELF_SUFFICIENCY,
+    derive_flows,
+)
+
+
+def _snapshot(
+    pv: float, battery: float, grid: float, load: float, charging: bool, selling: bool
+) -> dict[tuple[str, str], Any]:
+    return {
+        ("statistics", "pcs_pv_total_power"): pv,
+        ("statistics", "batconv_power"): battery,
+        ("statistics", "grid_power"): grid,
+        ("statistics", "load_power"): load,
+        ("direction", "is_battery_charging_"): charging,
+        ("direction", "is_grid_selling_"): selling,
+    }
+
+
+@pytest.mark.parametrize(
+    ("snapshot", "flows"),
+    [
+        # PV covers the load, charges the battery and sells the rest
+        (
+            _snapshot(3000, 1500, 500, 1000, charging=True, selling=True),
+            {
+                BATTERY_POWER: -1500,
+                GRID_POWER: -500,
+                PV_TO_LOAD: 1000,
+                PV_TO_BATTERY: 1500,
+                PV_TO_GRID: 500,
+                BATTERY_TO_LOAD: 0,
+                BATTERY_TO_GRID: 0,
+                GRID_TO_LOAD: 0,
+                GRID_TO_BATTERY: 0,
+                SELF_SUFFICIENCY: 100.0,
+            },
+        ),
+        # At night the battery feeds the load before the grid does
+        (
+            _snapshot(0, 500, 300, 800, charging=False, selling=False),
+            {
+                BATTERY_POWER: 500,
+                GRID_POWER: 300,
+                PV_TO_LOAD: 0,
+                PV_TO_BATTERY: 0,
+                PV_TO_GRID: 0,
+                BATTERY_TO_LOAD: 500,
+                BATTERY_TO_GRID: 0,
+                GRID_TO_LOAD: 300,
+                GRID_TO_BATTERY: 0,
+                SELF_SUFFICIENCY: 62.5,
+            },
+        ),
+        # Charging the battery from the grid
+        (
+            _snapshot(0, 1000, 1200, 200, charging=True, selling=False),
+            {
+                BATTERY_POWER: -1000,
+                GRID_POWER: 1200,
+                PV_TO_LOAD: 0,
+                PV_TO_BATTERY: 0,
+                PV_TO_GRID: 0,
+                BATTERY_TO_LOAD: 0,
+                BATTERY_TO_GRID: 0,
+                GRID_TO_LOAD: 200,
+                GRID_TO_BATTERY: 1000,
+                SELF_SUFFICIENCY: 0.0,
+            },
+        ),
+    ],
+)
+def test_derive_flows(
+    snapshot: dict[tuple[str, str], Any], flows: dict[str, float]
+) -> None:
+    """The power readings are split into flows between the nodes."""
+    assert derive_flows(snapshot) == {
+        (DERIVED, metric): value for metric, value in flows.items()
+    }
+
+
+def test_derive_flows_missing_reading() -> None:
+    """A missing power reading leaves all flows unknown."""
+    snapshot = _snapshot(3000, 1500, 500, 1000, charging=True, selling=True)
+    del snapshot[("statistics", "grid_power")]
+    assert derive_flows(snapshot) == {(DERIVED, metric): None for metric in METRICS}
@@ -0,0 +1,73 @@
+"""Tests for the readings kept in memory."""
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.lg_ess.const import DOMAIN, SERVICE_GET_HISTORY
+from custom_components.lg_ess.history import ReadingBuffer
+
+POWER = ("statistics", "grid_power")
+SOC = ("statistics", "bat_user_soc")
+
+
+def _buffer(capacity: int, rows: int) -> ReadingBuffer:
+    buffer = ReadingBuffer(capacity)
+    for row in range(rows):
+        # The state of charge is only reported from the third poll on
+        snapshot = {POWER: row * 10, SOC: 50.0 if row >= 2 else None}
+        buffer.append(float(row), snapshot)
+    return buffer
+
+
+def test_buffer_wraps() -> None:
+    """A full buffer overwrites the oldest rows."""
+    buffer = _buffer(3, 5)
+    assert len(buffer) == 3
+    assert buffer.query(0, 10) == {
+        "timestamps": [2.0, 3.0, 4.0],
+        "values": {
+            "statistics_grid_power": [20, 30, 40],
+            "statistics_bat_user_soc": [50.0, 50.0, 50.0],
+        },
+    }
+    assert buffer.query(3, 3, ["statistics_grid_power"]) == {
+        "timestamps": [3.0],
+        "values": {"statistics_grid_power": [30]},
+    }
+
+
+def test_buffer_resized() -> None:
+    """A resized buffer keeps the newest rows in order."""
+    buffer = _buffer(3, 4)
+    grown = buffer.resized(5)
+    assert grown.capacity == 5
+    assert grown.query(0, 10)["timestamps"] == [1.0, 2.0, 3.0]
+    assert grown.query(0, 10)["values"]["statistics_bat_user_soc"] == [
+        None,
+        50.0,
+        50.0,
+    ]
+    grown.append(4.0, {POWER: 40})
+    assert grown.query(0, 10)["timestamps"] == [1.0, 2.0, 3.0, 4.0]
+
+    shrunk = buffer.resized(2)
+    assert shrunk.query(0, 10)["timestamps"] == [2.0, 3.0]
+
+
+async def test_get_history(hass: HomeAssistant, config_entry: MockConfigEntry) -> None:
+    """The service returns the readings of the loaded entries."""
+    data = hass.data[DOMAIN][config_entry.entry_id]
+    for coordinator in (data.home, data.common):
+        await coordinator.async_refresh()
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        {"metrics": ["statistics_load_power", "GRID_active_power"]},
+        blocking=True,
+        return_response=True,
+    )
+    history = response[config_entry.entry_id]
+    assert history["home"]["values"] == {"statistics_load_power": [541]}
+    assert history["common"]["values"] == {"GRID_active_power": [9]}
+    assert len(history["home"]["timestamps"]) == 1
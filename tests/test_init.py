@@ -0,0 +1,37 @@
+"""Tests for the setup of the LG ESS integration."""
+
+from unittest.mock import patch
+
+from pyess.aio_ess import ESSException
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_HOST, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+
+from custom_components.lg_ess.client import DATA_CLIENTS, PooledESS
+from custom_components.lg_ess.const import DOMAIN
+
+from .const import HOST, PASSWORD
+
+
+async def test_failed_setup_keeps_shared_client(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """A failing entry of the same device keeps the client of the loaded one."""
+    ess = hass.data[DOMAIN][config_entry.entry_id].ess
+    other = MockConfigEntry(
+        domain=DOMAIN,
+        title="LG ESS 2",
+        unique_id="other",
+        data={CONF_HOST: HOST, CONF_PASSWORD: PASSWORD},
+        version=2,
+    )
+    other.add_to_hass(hass)
+    with patch.object(PooledESS, "get_state", side_effect=ESSException("down")):
+        assert not await hass.config_entries.async_setup(other.entry_id)
+    assert other.state is ConfigEntryState.SETUP_RETRY
+    assert hass.data[DATA_CLIENTS][HOST] is ess
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    assert HOST not in hass.data[DATA_CLIENTS]
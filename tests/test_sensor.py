@@ -0,0 +1,151 @@
+"""Tests for the LG ESS sensors."""
+
+from datetime import timedelta
+from typing import Any
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+from pyess.aio_ess import ESSException
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from custom_components.lg_ess.client import PooledESS
+from custom_components.lg_ess.const import (
+    CONF_DEADBAND_MAX_AGE,
+    CONF_DEADBAND_POWER,
+    DOMAIN,
+)
+
+from . import entity_id
+from .const import SERIAL
+
+
+@pytest.mark.parametrize(
+    "options", [{CONF_DEADBAND_POWER: 10, CONF_DEADBAND_MAX_AGE: 300}]
+)
+async def test_deadband_writes_after_max_age(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    payloads: dict[str, dict[str, Any]],
+) -> None:
+    """A suppressed change is written once the maximum age passed."""
+    home = hass.data[DOMAIN][config_entry.entry_id].home
+    load_power = entity_id(hass, "statistics_load_power")
+    assert hass.states.get(load_power).state == "541"
+
+    payloads["home"]["statistics"]["load_power"] = "545"
+    await home.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(load_power).state == "541"
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=301))
+    await hass.async_block_till_done()
+    assert hass.states.get(load_power).state == "545"
+
+
+async def test_last_poll_follows_unchanged_polls(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    config_entry: MockConfigEntry,
+) -> None:
+    """The time of the last poll moves with polls that change nothing."""
+    home = hass.data[DOMAIN][config_entry.entry_id].home
+    last_poll = entity_id(hass, "home_last_poll")
+    assert hass.states.get(last_poll).state == home.polled_at.isoformat(
+        timespec="seconds"
+    )
+
+    freezer.tick(10)
+    await home.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(last_poll).state == dt_util.utcnow().isoformat(
+        timespec="seconds"
+    )
+
+
+async def test_last_poll_stays_during_grace_period(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    config_entry: MockConfigEntry,
+) -> None:
+    """A failed poll keeps the values and the time of the last poll."""
+    home = hass.data[DOMAIN][config_entry.entry_id].home
+    last_poll = entity_id(hass, "home_last_poll")
+    load_power = entity_id(hass, "statistics_load_power")
+    polled = hass.states.get(last_poll).state
+
+    freezer.tick(10)
+    with patch.object(PooledESS, "get_state", side_effect=ESSException("down")):
+        await home.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(last_poll).state == polled
+    assert hass.states.get(load_power).state == "541"
+
+
+@pytest.mark.usefixtures("mock_ess")
+async def test_absent_feature_disabled(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    payloads: dict[str, dict[str, Any]],
+) -> None:
+    """Entities of an absent feature are disabled until it shows up."""
+    registry = er.async_get(hass)
+    registered = registry.async_get_or_create(
+        Platform.SENSOR,
+        DOMAIN,
+        f"${SERIAL}_$heatpump_heatpump_working",
+        config_entry=mock_config_entry,
+    )
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    entry = registry.async_get(registered.entity_id)
+    assert entry.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+    assert hass.states.get(registered.entity_id) is None
+    assert (
+        registry.async_get_entity_id(
+            Platform.SENSOR, DOMAIN, f"${SERIAL}_$heatpump_heatpump_activate"
+        )
+        is None
+    )
+
+    payloads["home"]["heatpump"]["heatpump_activate"] = "on"
+    payloads["home"]["heatpump"]["heatpump_working"] = "on"
+    home = hass.data[DOMAIN][mock_config_entry.entry_id].home
+    await home.async_refresh()
+    await hass.async_block_till_done()
+
+    assert registry.async_get(registered.entity_id).disabled_by is None
+    assert hass.states.get(registered.entity_id).state == "on"
+    assert hass.states.get(entity_id(hass, "heatpump_heatpump_activate")).state == "on"
+
+
+@pytest.mark.usefixtures("mock_ess")
+async def test_sticky_feature_kept_at_night(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    payloads: dict[str, dict[str, Any]],
+) -> None:
+    """A restart at night keeps the entities of a PV string seen before."""
+    registry = er.async_get(hass)
+    registered = registry.async_get_or_create(
+        Platform.SENSOR,
+        DOMAIN,
+        f"${SERIAL}_$PV_pv3_power",
+        config_entry=mock_config_entry,
+    )
+    payloads["common"]["PV"]["pv3_power"] = "0"
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert registry.async_get(registered.entity_id).disabled_by is None
+    assert hass.states.get(registered.entity_id).state == "0"
+    assert hass.states.get(entity_id(hass, "PV_pv3_voltage")).state == "35.5"
@@ -0,0 +1,73 @@
+"""Tests for the LG ESS websocket API."""
+
+from typing import Any
+from unittest.mock import patch
+
+from aiohttp import WSMsgType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from homeassistant.components.websocket_api import ERR_NOT_FOUND
+from homeassistant.core import HomeAssistant
+
+from custom_components.lg_ess.const import DOMAIN
+
+
+async def test_subscription_ends_on_unload(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    config_entry: MockConfigEntry,
+    payloads: dict[str, dict[str, Any]],
+) -> None:
+    """A reload ends the subscription to the coordinators of the old entry."""
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id(
+        {
+            "type": f"{DOMAIN}/subscribe",
+            "config_entry_id": config_entry.entry_id,
+            "metrics": ["statistics_load_power"],
+        }
+    )
+    assert (await client.receive_json())["success"]
+    event = (await client.receive_json())["event"]
+    assert event["coordinator"] == "home"
+    assert event["values"] == {"statistics_load_power": 541}
+
+    assert await hass.config_entries.async_reload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    message = await client.receive_json()
+    assert not message["success"]
+    assert message["error"]["code"] == ERR_NOT_FOUND
+
+    payloads["home"]["statistics"]["load_power"] = "700"
+    await hass.data[DOMAIN][config_entry.entry_id].home.async_refresh()
+    await hass.async_block_till_done()
+    await client.send_json_auto_id({"type": "ping"})
+    assert (await client.receive_json())["type"] == "pong"
+
+
+async def test_stalled_client_is_dropped(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    config_entry: MockConfigEntry,
+) -> None:
+    """A client that does not read its events loses the subscription."""
+    home = hass.data[DOMAIN][config_entry.entry_id].home
+    client = await hass_ws_client(hass)
+    with patch("homeassistant.components.websocket_api.http.MAX_PENDING_MSG", 3):
+        # The result and the first events of both coordinators overflow the
+        # pending messages before the writer gets to run
+        await client.send_json_auto_id(
+            {
+                "type": f"{DOMAIN}/subscribe",
+                "config_entry_id": config_entry.entry_id,
+                "changes_only": False,
+            }
+        )
+        message = await client.receive()
+    assert message.type is WSMsgType.CLOSE
+    await hass.async_block_till_done()
+    assert not home._sample_callbacks
+
+    await home.async_refresh()
+    await hass.async_block_till_done()